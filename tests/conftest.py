@@ -0,0 +1,15 @@
+"""Shared pytest setup: the watchers import each other as top-level modules."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "watchers"))
+
+
+@pytest.fixture
+def vault(tmp_path):
+    for name in ("Needs_Action", "Done", "Plans", "Logs", "Pending_Approval"):
+        (tmp_path / name).mkdir()
+    return tmp_path
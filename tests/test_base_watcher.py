@@ -0,0 +1,48 @@
+"""Tests for the helpers in watchers/base_watcher.py."""
+
+import json
+
+from base_watcher import append_log_entry, content_id, write_atomic
+
+
+def test_append_log_entry_starts_a_missing_log(tmp_path):
+    log_file = tmp_path / "2026-01-01.json"
+    append_log_entry(log_file, {"event_type": "a"})
+    assert json.loads(log_file.read_text()) == [{"event_type": "a"}]
+
+
+def test_append_log_entry_splices_into_the_array(tmp_path):
+    log_file = tmp_path / "2026-01-01.json"
+    for i in range(3):
+        append_log_entry(log_file, {"n": i, "nested": {"k": [1, 2]}})
+    assert json.loads(log_file.read_text()) == [
+        {"n": i, "nested": {"k": [1, 2]}} for i in range(3)
+    ]
+
+
+def test_append_log_entry_handles_empty_array_and_trailing_space(tmp_path):
+    log_file = tmp_path / "2026-01-01.json"
+    log_file.write_text("[]\n\n")
+    append_log_entry(log_file, {"n": 1})
+    assert json.loads(log_file.read_text()) == [{"n": 1}]
+
+
+def test_append_log_entry_restarts_an_unreadable_log(tmp_path):
+    log_file = tmp_path / "2026-01-01.json"
+    log_file.write_text('{"not": "an array"}')
+    append_log_entry(log_file, {"n": 1})
+    assert json.loads(log_file.read_text()) == [{"n": 1}]
+
+
+def test_write_atomic_replaces_contents(tmp_path):
+    path = tmp_path / "state.bin"
+    path.write_bytes(b"old")
+    write_atomic(path, b"new")
+    assert path.read_bytes() == b"new"
+    assert not (tmp_path / "state.bin.tmp").exists()
+
+
+def test_content_id_is_stable_and_distinct():
+    assert content_id("hello") == content_id("hello")
+    assert content_id("hello") != content_id("hello!")
+    assert len(content_id("hello")) == 16
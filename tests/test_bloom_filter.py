@@ -0,0 +1,67 @@
+"""Tests for watchers/bloom_filter.py."""
+
+import pytest
+
+from bloom_filter import BloomFilter, RotatingBloomFilter
+
+
+def test_added_ids_are_always_found():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    ids = [f"id_{i}" for i in range(1000)]
+    bloom.update(ids)
+    assert all(i in bloom for i in ids)
+
+
+def test_false_positive_rate_at_capacity():
+    bloom = BloomFilter(capacity=5000, error_rate=0.01)
+    bloom.update(f"seen_{i}" for i in range(5000))
+    false_hits = sum(f"new_{i}" in bloom for i in range(20000))
+    assert false_hits / 20000 < 0.02
+
+
+def test_overfilling_degrades_the_false_positive_rate():
+    # Sizing is fixed at construction: callers must pick a capacity that
+    # covers every ID they add (or rebuild or rotate the filter).
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    bloom.update(f"seen_{i}" for i in range(5000))
+    false_hits = sum(f"new_{i}" in bloom for i in range(5000))
+    assert false_hits / 5000 > 0.5
+
+
+def test_round_trip_through_bytes():
+    bloom = BloomFilter(capacity=100, error_rate=0.001)
+    bloom.update(["a", "b", "c"])
+    restored = BloomFilter.from_bytes(bloom.to_bytes())
+    assert (restored.size, restored.hashes) == (bloom.size, bloom.hashes)
+    assert restored.bits == bloom.bits
+    assert "b" in restored
+
+
+def test_truncated_bytes_are_rejected():
+    data = BloomFilter(capacity=100, error_rate=0.001).to_bytes()
+    with pytest.raises(ValueError):
+        BloomFilter.from_bytes(data[:-1])
+
+
+def test_rotation_keeps_recent_ids_and_bounds_false_positives():
+    bloom = RotatingBloomFilter(capacity=1000, error_rate=0.01)
+    bloom.update(f"seen_{i}" for i in range(5000))
+    assert all(f"seen_{i}" in bloom for i in range(4000, 5000))
+    false_hits = sum(f"new_{i}" in bloom for i in range(5000))
+    assert false_hits / 5000 < 0.03
+
+
+def test_rotating_filter_round_trips_through_bytes():
+    bloom = RotatingBloomFilter(capacity=100, error_rate=0.001)
+    bloom.update(f"id_{i}" for i in range(150))
+    restored = RotatingBloomFilter.from_bytes(bloom.to_bytes())
+    assert (restored.capacity, restored.count) == (100, 50)
+    assert all(f"id_{i}" in restored for i in range(150))
+
+
+def test_rotating_filter_adopts_a_plain_snapshot():
+    old = BloomFilter(capacity=100, error_rate=0.001)
+    old.add("legacy")
+    bloom = RotatingBloomFilter.from_bytes(old.to_bytes(), capacity=100, error_rate=0.001)
+    assert "legacy" in bloom
+    assert bloom.count == 0
@@ -0,0 +1,32 @@
+"""Tests for processed-ID persistence in watchers/facebook_watcher.py."""
+
+import json
+
+from facebook_watcher import FacebookWatcher
+
+
+def read_lines(path):
+    return path.read_text().splitlines() if path.exists() else []
+
+
+def test_facebook_log_is_compacted_to_its_tail_on_startup(vault):
+    log_file = vault / ".facebook_state.jsonl"
+    log_file.write_text("".join(json.dumps(f"fb_{i}") + "\n" for i in range(600)))
+    watcher = FacebookWatcher(str(vault), str(vault / "session"))
+    assert len(read_lines(log_file)) == 500
+    assert "fb_599" in watcher._processed_ids
+    assert "fb_0" not in watcher._processed_ids
+
+
+def test_facebook_cycle_appends_its_ids_at_the_end(vault, monkeypatch):
+    watcher = FacebookWatcher(str(vault), str(vault / "session"))
+    log_file = vault / ".facebook_state.jsonl"
+
+    def create_action_file(item_id):
+        watcher._save_processed(item_id)
+        assert not log_file.exists()  # buffered until the cycle ends
+        return vault / "Needs_Action" / f"{item_id}.md"
+
+    monkeypatch.setattr(watcher, "create_action_file", create_action_file)
+    watcher.create_action_files(["fb_a", "fb_b"])
+    assert read_lines(log_file) == ['"fb_a"', '"fb_b"']
@@ -0,0 +1,23 @@
+"""Tests for filename priority detection in watchers/filesystem_watcher.py."""
+
+from filesystem_watcher import detect_priority
+
+
+def test_no_keyword_is_low_priority():
+    assert detect_priority("holiday_photos.zip") == "P3"
+
+
+def test_keywords_are_case_insensitive():
+    assert detect_priority("URGENT_notes.txt") == "P0"
+    assert detect_priority("Invoice-42.pdf") == "P1"
+
+
+def test_earliest_listed_keyword_wins():
+    # "review" comes after "invoice" in PRIORITY_KEYWORDS
+    assert detect_priority("review_invoice.pdf") == "P1"
+    assert detect_priority("report_asap.docx") == "P0"
+
+
+def test_keywords_match_inside_words():
+    assert detect_priority("Q3_reports_final.xlsx") == "P2"
+    assert detect_priority("unimportant.txt") == "P1"
@@ -0,0 +1,46 @@
+"""Tests for watchers/gmail_watcher.py."""
+
+import gmail_watcher
+
+
+def read_lines(path):
+    return path.read_text().splitlines() if path.exists() else []
+
+
+def test_gmail_log_is_folded_into_the_snapshot(vault, monkeypatch):
+    monkeypatch.setattr(gmail_watcher, "COMPACT_EVERY", 3)
+    monkeypatch.setattr(gmail_watcher.GmailWatcher, "_init_gmail", lambda self: None)
+    watcher = gmail_watcher.GmailWatcher(str(vault), "credentials.json", "token.json")
+    log_file = vault / ".gmail_state.log"
+
+    watcher._save_processed_ids("m1")
+    watcher._save_processed_ids("m2")
+    assert read_lines(log_file) == ["m1", "m2"]
+    assert not (vault / ".gmail_state.bloom").exists()
+
+    watcher._save_processed_ids("m3")
+    watcher._save_processed_ids("m4")
+    # Compacted at the third ID; the fourth starts a new log
+    assert read_lines(log_file) == ["m4"]
+    assert (vault / ".gmail_state.bloom").exists()
+
+    reloaded = gmail_watcher.GmailWatcher(str(vault), "credentials.json", "token.json")
+    assert all(m in reloaded.processed_ids for m in ("m1", "m2", "m3", "m4"))
+    assert reloaded._log_count == 1
+
+
+def test_gmail_keywords_ignore_longer_words():
+    matcher = gmail_watcher._KEYWORD_MATCHER
+    assert matcher.find("thanks for the feedback on the costume; card issued") == []
+    assert matcher.find("fees and costs for the open issues") == ["cost", "fee", "issue"]
+
+
+def test_gmail_skips_mark_read_without_the_modify_scope(vault, monkeypatch):
+    monkeypatch.setattr(gmail_watcher.GmailWatcher, "_init_gmail", lambda self: None)
+    watcher = gmail_watcher.GmailWatcher(str(vault), "credentials.json", "token.json")
+    calls = []
+    watcher._execute = calls.append
+    watcher._pending_read = ["m1", "m2"]
+    watcher._mark_read()
+    assert calls == []
+    assert watcher._pending_read == []
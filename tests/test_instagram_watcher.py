@@ -0,0 +1,23 @@
+"""Tests for processed-ID persistence in watchers/instagram_watcher.py."""
+
+import instagram_watcher
+
+
+def read_lines(path):
+    return path.read_text().splitlines() if path.exists() else []
+
+
+def test_instagram_log_keeps_the_most_recent_ids(vault, monkeypatch):
+    monkeypatch.setattr(instagram_watcher, "MAX_PROCESSED", 3)
+    watcher = instagram_watcher.InstagramWatcher(str(vault), str(vault / "session"))
+    log_file = vault / ".instagram_state.log"
+    for item_id in ("i1", "i2", "i3", "i4"):
+        watcher._save_processed(item_id)
+    watcher._state_fp.close()
+    # Compacted to the 3 most recent at the third append, then one more line
+    assert read_lines(log_file) == ["i1", "i2", "i3", "i4"]
+
+    reloaded = instagram_watcher.InstagramWatcher(str(vault), str(vault / "session"))
+    reloaded._state_fp.close()
+    assert read_lines(log_file) == ["i2", "i3", "i4"]
+    assert all(i in reloaded._processed_ids for i in ("i2", "i3", "i4"))
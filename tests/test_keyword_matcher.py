@@ -0,0 +1,62 @@
+"""Tests for watchers/keyword_matcher.py."""
+
+from keyword_matcher import KeywordMatcher, WordMatcher, scan_message
+
+KEYWORDS = ["invoice", "collab", "collaboration", "Fee", "reach out", "ad"]
+
+
+def test_keyword_matcher_matches_the_naive_scan():
+    matcher = KeywordMatcher(KEYWORDS)
+    texts = [
+        "",
+        "please send the invoice",
+        "open to a collaboration? coffee fee",
+        "reach out when you read this",
+        "nothing relevant here",
+    ]
+    for text in texts:
+        lower = text.lower()
+        expected = [kw for kw in matcher.keywords if kw in lower]
+        assert matcher.find(lower) == expected
+        assert matcher.search(lower) is bool(expected)
+
+
+def test_keyword_matcher_lowercases_and_dedupes_keywords():
+    matcher = KeywordMatcher(["Invoice", "invoice", "FEE"])
+    assert matcher.keywords == ("invoice", "fee")
+
+
+def test_keyword_matcher_reports_nested_keywords():
+    matcher = KeywordMatcher(KEYWORDS)
+    assert matcher.find("a collaboration") == ["collab", "collaboration"]
+
+
+def test_word_matcher_matches_whole_words_and_plurals():
+    matcher = WordMatcher(KEYWORDS)
+    assert matcher.find("fees and ads") == ["fee", "ad"]
+    assert matcher.find("coffee, read, unpaid") == []
+    assert matcher.search("coffee") is False
+
+
+def test_word_matcher_ignores_words_that_start_with_a_short_keyword():
+    matcher = WordMatcher(["ad", "dm", "post"])
+    assert matcher.find("admin") == []
+    assert matcher.find("address") == []
+    assert matcher.find("dmitri") == []
+    assert matcher.find("dms about the posts") == ["dm", "post"]
+
+
+def test_word_matcher_matches_phrases():
+    matcher = WordMatcher(KEYWORDS)
+    assert matcher.find("please reach out soon") == ["reach out"]
+    assert matcher.search("outreach") is False
+
+
+def test_scan_message_splits_and_scans_the_snippet():
+    matcher = KeywordMatcher(KEYWORDS)
+    text = "Alice Smith\nNeed an invoice " + "x" * 600 + " fee"
+    snippet, first_line, keywords = scan_message(text, matcher, limit=100)
+    assert snippet == text[:100]
+    assert first_line == "Alice Smith"
+    # "fee" is past the snippet, so it is not flagged
+    assert keywords == ["invoice"]
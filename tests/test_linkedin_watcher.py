@@ -0,0 +1,34 @@
+"""Tests for approved-post parsing in watchers/linkedin_watcher.py."""
+
+from linkedin_watcher import _flow_list, _split_frontmatter
+
+
+def test_split_frontmatter_reads_key_values_and_body():
+    raw = "---\ntype: linkedin_post\nhashtags: [AI, Business]\n---\n\nHello LinkedIn!\n"
+    frontmatter, body = _split_frontmatter(raw)
+    assert frontmatter == {"type": "linkedin_post", "hashtags": "[AI, Business]"}
+    assert body == "Hello LinkedIn!"
+
+
+def test_split_frontmatter_handles_crlf_and_colons_in_values():
+    raw = "---\r\ntitle: Q3: results\r\n---\r\nBody line\r\n"
+    frontmatter, body = _split_frontmatter(raw)
+    assert frontmatter == {"title": "Q3: results"}
+    assert body == "Body line"
+
+
+def test_split_frontmatter_without_frontmatter_returns_the_text():
+    assert _split_frontmatter("Just a post") == ({}, "Just a post")
+    # An unterminated block is not frontmatter either
+    assert _split_frontmatter("---\ntype: x\nbody") == ({}, "---\ntype: x\nbody")
+
+
+def test_flow_list_parses_items_and_strips_quotes():
+    assert _flow_list('[AI, "Business", \'Automation\']') == ["AI", "Business", "Automation"]
+
+
+def test_flow_list_skips_empty_items_and_non_lists():
+    assert _flow_list("[AI, , ]") == ["AI"]
+    assert _flow_list("[]") == []
+    assert _flow_list("AI, Business") == []
+    assert _flow_list("") == []
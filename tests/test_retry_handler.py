@@ -0,0 +1,80 @@
+"""Tests for watchers/retry_handler.py."""
+
+import threading
+
+import pytest
+
+import retry_handler
+from retry_handler import RateLimiter, TransientError, with_retry
+
+HOUR_NS = 3_600_000_000_000
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.monotonic_ns for the rate limiter."""
+    now = [10**12]
+    monkeypatch.setattr(retry_handler.time, "monotonic_ns", lambda: now[0])
+    return now
+
+
+def test_rate_limiter_allows_a_full_bucket_then_blocks(clock):
+    limiter = RateLimiter(max_per_hour=3)
+    assert [limiter.allow() for _ in range(4)] == [True, True, True, False]
+
+
+def test_rate_limiter_refills_one_token_per_interval(clock):
+    limiter = RateLimiter(max_per_hour=4)
+    for _ in range(4):
+        limiter.allow()
+    clock[0] += HOUR_NS // 4 - 1  # just short of one token
+    assert limiter.allow() is False
+    clock[0] += 1
+    assert limiter.allow() is True
+    assert limiter.allow() is False
+
+
+def test_rate_limiter_accumulates_partial_refills(clock):
+    limiter = RateLimiter(max_per_hour=10)
+    for _ in range(10):
+        limiter.allow()
+    # Ten polls a tenth of a token apart add up to one whole token
+    for _ in range(10):
+        clock[0] += HOUR_NS // 100
+        allowed = limiter.allow()
+    assert allowed is True
+
+
+def test_rate_limiter_caps_at_capacity(clock):
+    limiter = RateLimiter(max_per_hour=2)
+    clock[0] += 10 * HOUR_NS
+    assert [limiter.allow() for _ in range(3)] == [True, True, False]
+
+
+def test_with_retry_retries_transient_errors():
+    calls = []
+
+    @with_retry(max_attempts=3, base_delay=0, jitter=False)
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise TransientError("try again")
+        return "ok"
+
+    assert flaky() == "ok"
+    assert len(calls) == 3
+
+
+def test_with_retry_stop_event_cancels_the_backoff():
+    stop = threading.Event()
+    stop.set()
+    calls = []
+
+    @with_retry(max_attempts=5, base_delay=60, stop_event=stop)
+    def failing():
+        calls.append(1)
+        raise TransientError("down")
+
+    with pytest.raises(TransientError):
+        failing()
+    assert len(calls) == 1
@@ -0,0 +1,39 @@
+"""Tests for processed-ID persistence in watchers/twitter_watcher.py."""
+
+import json
+
+import twitter_watcher
+
+
+def read_lines(path):
+    return path.read_text().splitlines() if path.exists() else []
+
+
+def test_twitter_log_is_flushed_per_cycle_and_compacted(vault, monkeypatch):
+    monkeypatch.setattr(twitter_watcher, "COMPACT_EVERY", 3)
+    watcher = twitter_watcher.TwitterWatcher(str(vault), str(vault / "session"))
+    log_file = vault / ".twitter_state.log"
+
+    watcher._mark_processed("t1")
+    watcher._mark_processed("t2")
+    assert read_lines(log_file) == []  # buffered until the cycle ends
+    watcher._save_processed()
+    assert read_lines(log_file) == ["t1", "t2"]
+
+    watcher._mark_processed("t3")
+    watcher._save_processed()
+    assert read_lines(log_file) == []
+    assert (vault / ".twitter_state.bloom").exists()
+
+    watcher._mark_processed("t4")
+    watcher._save_processed()
+    reloaded = twitter_watcher.TwitterWatcher(str(vault), str(vault / "session"))
+    assert all(t in reloaded._processed_ids for t in ("t1", "t2", "t3", "t4"))
+
+
+def test_twitter_migrates_the_legacy_json_list(vault):
+    (vault / ".twitter_state.json").write_text(json.dumps({"processed_ids": ["old1", "old2"]}))
+    watcher = twitter_watcher.TwitterWatcher(str(vault), str(vault / "session"))
+    assert "old1" in watcher._processed_ids
+    assert not (vault / ".twitter_state.json").exists()
+    assert (vault / ".twitter_state.bloom").exists()
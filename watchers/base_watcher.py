@@ -1,12 +1,20 @@
 """base_watcher.py - Template for all watchers in the Personal AI Employee system."""
 
-import time
+import os
+import hashlib
 import logging
 import json
+import threading
 from pathlib import Path
 from abc import ABC, abstractmethod
 from datetime import datetime
 
+try:
+    import xxhash  # optional — faster than blake2b for short strings
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -15,6 +23,79 @@ logging.basicConfig(
 )
 
 
+def append_log_entry(log_file: Path, entry: dict):
+    """
+    Append one entry to a /Logs/YYYY-MM-DD.json day log.
+
+    The file stays a JSON array (other tools json.loads it), but the entry is
+    spliced in before the closing "]" instead of re-reading and rewriting the
+    whole day's log on every event. A missing or unreadable file is started
+    fresh, as before.
+    """
+    body = "  " + json.dumps(entry, indent=2).replace("\n", "\n  ")
+    try:
+        with open(log_file, "r+b") as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(0, size - 256))
+            tail = f.read()
+            end = tail.rstrip()
+            if not end.endswith(b"]"):
+                raise ValueError("not a JSON array")
+            last = end[:-1].rstrip()  # everything up to the last element
+            f.seek(size - len(tail) + len(last))
+            sep = "\n" if last.endswith(b"[") else ",\n"
+            f.write((sep + body + "\n]").encode())
+            f.truncate()
+    except (OSError, ValueError):
+        log_file.write_text(json.dumps([entry], indent=2))
+
+
+def write_atomic(path: Path, data: bytes):
+    """
+    Replace a state file's contents without a window where it is truncated.
+
+    The data goes to a sibling temp file that is then renamed over ``path``
+    (os.replace is atomic on POSIX and Windows), so a crash mid-write leaves
+    either the old or the new contents, never a partial file.
+    """
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+# Flags for write_file: create or truncate, and don't leak the fd to children
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_CLOEXEC", 0)
+
+
+def write_file(path: Path, text: str):
+    """
+    Write an action file's text with raw os.open/os.write calls.
+
+    Path.write_text goes through a TextIOWrapper and its codec on top of the
+    same syscalls; the content is encoded once here and written directly.
+    """
+    data = memoryview(text.encode())
+    fd = os.open(path, _WRITE_FLAGS, 0o644)
+    try:
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
+
+
+def content_id(text: str) -> str:
+    """
+    Stable 64-bit hex digest of scraped text, for de-duplication IDs.
+
+    Unlike hash(), the value survives restarts (no PYTHONHASHSEED salt),
+    so IDs persisted in the vault state files keep matching.
+    """
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_64_hexdigest(text)
+    return hashlib.blake2b(text.encode(), digest_size=8).hexdigest()
+
+
 class BaseWatcher(ABC):
     """
     Abstract base class for all AI Employee watchers.
@@ -30,6 +111,9 @@ class BaseWatcher(ABC):
         self.check_interval = check_interval
         self.logger = logging.getLogger(self.__class__.__name__)
         self._running = False
+        # Set by stop(): wakes the poll sleep and cancels pending retry
+        # backoffs that were given it (with_retry(stop_event=...))
+        self._stop_event = threading.Event()
 
         # Validate vault structure
         self._validate_vault()
@@ -56,6 +140,31 @@ class BaseWatcher(ABC):
         """Create a .md file in the Needs_Action folder."""
         pass
 
+    def create_action_files(self, items: list) -> list:
+        """
+        Create action files for one polling cycle's items.
+
+        Override to batch per-cycle work (e.g. persisting processed IDs once
+        after the loop instead of once per item).
+        """
+        created = []
+        for item in items:
+            try:
+                filepath = self.create_action_file(item)
+                self.logger.info(f"Created action file: {filepath.name}")
+                self.log_event("action_file_created", {"file": str(filepath.name)})
+                created.append(filepath)
+            except Exception as e:
+                self.logger.error(f"Failed to create action file for item: {e}")
+        return created
+
+    def next_interval(self, found: int) -> float:
+        """Seconds to sleep before the next poll, given this cycle's item count.
+
+        Fixed at check_interval; override for adaptive polling.
+        """
+        return self.check_interval
+
     def log_event(self, event_type: str, details: dict):
         """Write a structured log entry to /Logs/YYYY-MM-DD.json."""
         today = datetime.now().strftime("%Y-%m-%d")
@@ -68,31 +177,20 @@ class BaseWatcher(ABC):
             **details,
         }
 
-        entries = []
-        if log_file.exists():
-            try:
-                entries = json.loads(log_file.read_text())
-            except json.JSONDecodeError:
-                entries = []
-
-        entries.append(entry)
-        log_file.write_text(json.dumps(entries, indent=2))
+        append_log_entry(log_file, entry)
 
     def run(self):
         """Main loop: poll for updates and create action files."""
         self.logger.info(f"Starting {self.__class__.__name__} (interval: {self.check_interval}s)")
         self._running = True
+        self._stop_event.clear()
 
         while self._running:
+            items = []
             try:
                 items = self.check_for_updates()
-                for item in items:
-                    try:
-                        filepath = self.create_action_file(item)
-                        self.logger.info(f"Created action file: {filepath.name}")
-                        self.log_event("action_file_created", {"file": str(filepath.name)})
-                    except Exception as e:
-                        self.logger.error(f"Failed to create action file for item: {e}")
+                if items:
+                    self.create_action_files(items)
             except KeyboardInterrupt:
                 self.logger.info("Shutdown requested. Stopping watcher.")
                 self._running = False
@@ -101,10 +199,12 @@ class BaseWatcher(ABC):
                 self.logger.error(f"Error in check_for_updates: {e}")
 
             if self._running:
-                time.sleep(self.check_interval)
+                # Woken early by stop(), so shutdown doesn't wait out the interval
+                self._stop_event.wait(self.next_interval(len(items)))
 
         self.logger.info(f"{self.__class__.__name__} stopped.")
 
     def stop(self):
-        """Gracefully stop the watcher."""
+        """Gracefully stop the watcher, cancelling any pending retry backoff."""
         self._running = False
+        self._stop_event.set()
@@ -0,0 +1,140 @@
+"""bloom_filter.py - Compact seen-ID pre-filter for AI Employee watchers.
+
+Gold Tier: constant-size seen-ID tracking for the watchers, either in front of
+an authoritative set or as the processed-ID store itself.
+"""
+
+import hashlib
+import math
+import struct
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over string IDs.
+
+    ``id in bloom`` is False only when the ID was never added, so callers can
+    skip their authoritative lookup for new items and confirm positives
+    against it. False positives occur at roughly ``error_rate`` once
+    ``capacity`` IDs have been added. to_bytes()/from_bytes() persist it.
+
+    Usage:
+        bloom = BloomFilter(capacity=10000, error_rate=0.001)
+        bloom.add("fb_1a2b3c")
+        if item_id in bloom and item_id in processed_ids: ...
+    """
+
+    def __init__(self, capacity: int = 10000, error_rate: float = 0.001):
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        # Double hashing (Kirsch-Mitzenmacher): k positions from one digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, item: str):
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def update(self, items):
+        for item in items:
+            self.add(item)
+
+    def __contains__(self, item: str) -> bool:
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    def to_bytes(self) -> bytes:
+        """Serialize as a 12-byte (size, hashes) header plus the bit array."""
+        return struct.pack("<QI", self.size, self.hashes) + bytes(self.bits)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "BloomFilter":
+        """Rebuild a filter written by to_bytes()."""
+        size, hashes = struct.unpack_from("<QI", data)
+        if len(data) - 12 != (size + 7) // 8:
+            raise ValueError("truncated Bloom filter data")
+        bloom = cls.__new__(cls)
+        bloom.size = size
+        bloom.hashes = hashes
+        bloom.bits = bytearray(data[12:])
+        return bloom
+
+
+class RotatingBloomFilter:
+    """
+    Two-generation Bloom filter for an unbounded stream of IDs.
+
+    IDs go into the current generation; once it holds ``capacity`` of them
+    it becomes the previous generation and a fresh one is started, dropping
+    the one before. Lookups check both, so the most recent ``capacity`` IDs
+    are always remembered and the false-positive rate stays below about
+    ``2 * error_rate`` however many IDs are added. Same add/update/``in``/
+    to_bytes()/from_bytes() interface as BloomFilter.
+
+    Usage:
+        seen = RotatingBloomFilter(capacity=50_000, error_rate=1e-5)
+        seen.add(message_id)
+    """
+
+    MAGIC = b"RBF1"
+
+    def __init__(self, capacity: int = 10000, error_rate: float = 0.001, previous=None):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.current = BloomFilter(capacity, error_rate)
+        self.previous = previous
+        self.count = 0  # IDs added to the current generation
+
+    def add(self, item: str):
+        if self.count >= self.capacity:
+            self.previous = self.current
+            self.current = BloomFilter(self.capacity, self.error_rate)
+            self.count = 0
+        self.current.add(item)
+        self.count += 1
+
+    def update(self, items):
+        for item in items:
+            self.add(item)
+
+    def __contains__(self, item: str) -> bool:
+        return item in self.current or (self.previous is not None and item in self.previous)
+
+    def to_bytes(self) -> bytes:
+        """Serialize as a header, then the current and previous generations."""
+        current = self.current.to_bytes()
+        previous = self.previous.to_bytes() if self.previous is not None else b""
+        return (
+            self.MAGIC
+            + struct.pack("<QdQQ", self.capacity, self.error_rate, self.count, len(current))
+            + current
+            + previous
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes, capacity: int = 10000, error_rate: float = 0.001):
+        """
+        Rebuild a filter written by to_bytes().
+
+        A plain BloomFilter snapshot (written before rotation was added) is
+        kept as the previous generation of a new filter with the given
+        capacity and error_rate.
+        """
+        if not data.startswith(cls.MAGIC):
+            return cls(capacity, error_rate, previous=BloomFilter.from_bytes(data))
+        offset = len(cls.MAGIC)
+        capacity, error_rate, count, current_len = struct.unpack_from("<QdQQ", data, offset)
+        offset += struct.calcsize("<QdQQ")
+        bloom = cls.__new__(cls)
+        bloom.capacity = capacity
+        bloom.error_rate = error_rate
+        bloom.count = count
+        bloom.current = BloomFilter.from_bytes(data[offset:offset + current_len])
+        rest = data[offset + current_len:]
+        bloom.previous = BloomFilter.from_bytes(rest) if rest else None
+        return bloom
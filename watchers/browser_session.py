@@ -0,0 +1,82 @@
+"""browser_session.py - Shared Playwright login sessions for AI Employee watchers.
+
+Gold Tier: a watcher keeps its browser open for its whole life, while the
+orchestrator launches short-lived browsers for approved posts and replies.
+Chromium lets only one process open a profile directory, so both sides load
+the login from <session path>/state.json (Playwright storage_state) into
+their own non-persistent contexts instead of sharing the profile.
+"""
+
+import json
+from pathlib import Path
+
+from base_watcher import write_atomic
+
+STORAGE_STATE_FILE = "state.json"
+
+
+def storage_state_path(session_path) -> Path:
+    """Path of the saved storage_state inside a session directory."""
+    return Path(session_path) / STORAGE_STATE_FILE
+
+
+def _has_profile(session_path: Path) -> bool:
+    """True if session_path holds a Chromium profile (a pre-state.json login)."""
+    return session_path.is_dir() and any(
+        p.name != STORAGE_STATE_FILE for p in session_path.iterdir()
+    )
+
+
+def save_storage_state(context, session_path):
+    """Write a sync context's cookies + localStorage to state.json atomically."""
+    write_atomic(storage_state_path(session_path), json.dumps(context.storage_state()).encode())
+
+
+async def save_storage_state_async(context, session_path):
+    """Async version of save_storage_state."""
+    state = await context.storage_state()
+    write_atomic(storage_state_path(session_path), json.dumps(state).encode())
+
+
+def new_context(playwright, session_path, headless: bool = True, args=None, **options):
+    """
+    Launch Chromium and open a context logged in from state.json.
+
+    Returns (browser, context); close the context, then the browser. A session
+    directory that only has a Chromium profile (set up before state.json was
+    used) is exported to state.json once, so existing logins carry over.
+    """
+    session_path = Path(session_path)
+    state = storage_state_path(session_path)
+    if not state.exists() and _has_profile(session_path):
+        profile = playwright.chromium.launch_persistent_context(
+            str(session_path), headless=True, args=args or []
+        )
+        try:
+            save_storage_state(profile, session_path)
+        finally:
+            profile.close()
+    browser = playwright.chromium.launch(headless=headless, args=args or [])
+    context = browser.new_context(
+        storage_state=str(state) if state.exists() else None, **options
+    )
+    return browser, context
+
+
+async def new_context_async(playwright, session_path, headless: bool = True, args=None, **options):
+    """Async version of new_context."""
+    session_path = Path(session_path)
+    state = storage_state_path(session_path)
+    if not state.exists() and _has_profile(session_path):
+        profile = await playwright.chromium.launch_persistent_context(
+            str(session_path), headless=True, args=args or []
+        )
+        try:
+            await save_storage_state_async(profile, session_path)
+        finally:
+            await profile.close()
+    browser = await playwright.chromium.launch(headless=headless, args=args or [])
+    context = await browser.new_context(
+        storage_state=str(state) if state.exists() else None, **options
+    )
+    return browser, context
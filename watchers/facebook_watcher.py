@@ -13,27 +13,27 @@ Usage:
     python3 watchers/facebook_watcher.py --vault AI_Employee_Vault
 
 Environment variables:
-    FACEBOOK_SESSION_PATH  — path to Playwright persistent context dir
+    FACEBOOK_SESSION_PATH  — session dir (state.json login; legacy Chromium profile)
     DRY_RUN                — if "true", skip actual navigation
+    FACEBOOK_STRICT_MODE   — if "true", ignore notifications with no business keywords
 """
 
 import argparse
+import asyncio
 import json
 import logging
 import os
 import sys
 import time
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
-from base_watcher import BaseWatcher
-
-try:
-    from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
-    PLAYWRIGHT_AVAILABLE = True
-except ImportError:
-    PLAYWRIGHT_AVAILABLE = False
+from base_watcher import BaseWatcher, content_id
+from bloom_filter import BloomFilter
+from browser_session import new_context, new_context_async, save_storage_state, save_storage_state_async
+from keyword_matcher import KeywordMatcher, scan_message
 
 logger = logging.getLogger("FacebookWatcher")
 
@@ -69,9 +69,42 @@ BUSINESS_KEYWORDS = [
     "ad", "brand deal", "affiliate", "ambassador",
 ]
 
+_KEYWORD_MATCHER = KeywordMatcher(BUSINESS_KEYWORDS)
+
 FB_URL = "https://www.facebook.com"
 FB_NOTIFICATIONS_URL = "https://www.facebook.com/notifications"
 
+CHROMIUM_ARGS = ["--no-sandbox", "--disable-dev-shm-usage"]
+
+# page.eval_on_selector_all snippet: for the first n matches, the trimmed
+# innerText plus the business keywords it contains, matched in the browser
+# so the texts cross the CDP boundary once, already classified.
+_NOTIF_SCAN_JS = """(els, {n, kws}) => els.slice(0, n).map(e => {
+    const text = (e.innerText || '').trim();
+    const lower = text.toLowerCase();
+    return {text, keywords: kws.filter(k => lower.includes(k))};
+})"""
+_NOTIF_SCAN_ARG = {"n": 15, "kws": list(_KEYWORD_MATCHER.keywords)}
+
+_PLAYWRIGHT = None
+
+
+def _load_playwright():
+    """Import Playwright on first use so dry-run / idle ticks never pay for it.
+
+    Returns (sync_playwright, async_playwright, PlaywrightTimeout), or None
+    if not installed. Both APIs raise the same TimeoutError class.
+    """
+    global _PLAYWRIGHT
+    if _PLAYWRIGHT is None:
+        try:
+            from playwright.async_api import async_playwright
+            from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
+            _PLAYWRIGHT = (sync_playwright, async_playwright, PlaywrightTimeout)
+        except ImportError:
+            _PLAYWRIGHT = False
+    return _PLAYWRIGHT or None
+
 
 class FacebookWatcher(BaseWatcher):
     """Playwright-based Facebook watcher."""
@@ -80,63 +113,203 @@ class FacebookWatcher(BaseWatcher):
         super().__init__(vault_path, check_interval=180)  # every 3 min
         self.session_path = Path(session_path)
         self.dry_run = os.getenv("DRY_RUN", "false").lower() == "true"
-        self._processed_ids: set = self._load_processed()
-
-    def _load_processed(self) -> set:
+        self.strict_mode = os.getenv("FACEBOOK_STRICT_MODE", "false").lower() == "true"
+        state = self._load_state()
+        # Last notification selector that matched — tried first next cycle
+        self._notif_selector = state.get("notif_selector")
+        self._processed_ids: set = self._load_processed(state.get("processed_ids", []))
+        if "processed_ids" in state:
+            self._save_state()  # IDs now live in .facebook_state.jsonl
+        # Pre-filter: most scraped IDs are new, and a bloom miss settles that
+        # without touching the set; positives are confirmed against the set.
+        self._bloom = BloomFilter(capacity=10000, error_rate=0.001)
+        self._bloom.update(self._processed_ids)
+        # IDs processed during create_action_files, appended in one write
+        self._unsaved = None
+        # Long-lived async browser, reused across polling cycles (see
+        # _ensure_browser). Its objects are bound to this event loop, so the
+        # loop lives as long as the watcher instead of one asyncio.run() per cycle.
+        self._loop = None
+        self._pw = None
+        self._browser = None
+        self._ctx = None
+        self._page = None
+        self._dm_page = None
+
+    def _load_state(self) -> dict:
         state_file = self.vault_path / ".facebook_state.json"
         if state_file.exists():
             try:
-                data = json.loads(state_file.read_text())
-                return set(data.get("processed_ids", []))
+                return json.loads(state_file.read_text())
             except Exception:
                 pass
-        return set()
+        return {}
 
-    def _save_processed(self):
+    def _save_state(self):
         state_file = self.vault_path / ".facebook_state.json"
-        state_file.write_text(json.dumps(
-            {"processed_ids": list(self._processed_ids)[-500:]},
-            indent=2,
-        ))
+        state_file.write_text(json.dumps({"notif_selector": self._notif_selector}, indent=2))
+
+    def _load_processed(self, legacy_ids: list) -> set:
+        """Load processed IDs from the append-only .facebook_state.jsonl.
+
+        Only the last 500 entries are kept; the log is compacted to that
+        tail on startup. IDs from the old .facebook_state.json list are
+        carried over once.
+        """
+        log_file = self.vault_path / ".facebook_state.jsonl"
+        recent = deque(legacy_ids, maxlen=500)
+        lines = 0
+        if log_file.exists():
+            with open(log_file) as f:
+                for line in f:
+                    lines += 1
+                    try:
+                        recent.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue
+        if legacy_ids or lines > len(recent):
+            log_file.write_text("".join(json.dumps(i) + "\n" for i in recent))
+        return set(recent)
+
+    def _save_processed(self, item_id: str):
+        """Mark an item processed: one JSON line appended, no full rewrite.
+
+        Inside create_action_files the line is buffered and written with the
+        rest of the batch.
+        """
+        self._processed_ids.add(item_id)
+        self._bloom.add(item_id)
+        if self._unsaved is not None:
+            self._unsaved.append(item_id)
+            return
+        with open(self.vault_path / ".facebook_state.jsonl", "a") as f:
+            f.write(json.dumps(item_id) + "\n")
+
+    def create_action_files(self, items: list) -> list:
+        """Create a cycle's action files, then append all their IDs at once."""
+        self._unsaved = []
+        try:
+            return super().create_action_files(items)
+        finally:
+            unsaved, self._unsaved = self._unsaved, None
+            if unsaved:
+                with open(self.vault_path / ".facebook_state.jsonl", "a") as f:
+                    f.write("".join(json.dumps(i) + "\n" for i in unsaved))
 
     def check_for_updates(self) -> list:
         if self.dry_run:
             logger.info("[DRY RUN] Skipping Facebook check.")
             return []
-        if not PLAYWRIGHT_AVAILABLE:
+        pw = _load_playwright()
+        if pw is None:
             logger.warning("Playwright not installed.")
             return []
+        _, async_playwright, PlaywrightTimeout = pw
         if not self.session_path.exists():
             logger.warning(f"Facebook session not found. Run --setup first.")
             return []
 
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(
+            self._check_async(async_playwright, PlaywrightTimeout)
+        )
+
+    async def _check_async(self, async_playwright, PlaywrightTimeout) -> list:
+        """Fetch notifications and DMs concurrently on two tabs of one context."""
         items = []
         try:
-            with sync_playwright() as p:
-                browser = p.chromium.launch_persistent_context(
-                    str(self.session_path),
-                    headless=True,
-                    args=["--no-sandbox", "--disable-dev-shm-usage"],
-                )
-                page = browser.pages[0] if browser.pages else browser.new_page()
-                notifications = self._get_notifications(page)
-                items.extend(notifications)
-                dms = self._get_dms(page)
-                items.extend(dms)
-                browser.close()
+            notif_page, dm_page = await self._ensure_browser(async_playwright)
+            # Both fetches are dominated by navigation and settle waits, so
+            # running them side by side roughly halves the cycle time.
+            notifications, dms = await asyncio.gather(
+                self._get_notifications(notif_page),
+                self._get_dms(dm_page),
+            )
+            items.extend(notifications)
+            items.extend(dms)
         except PlaywrightTimeout:
             logger.warning("Playwright timeout during Facebook check.")
         except Exception as e:
             logger.error(f"Facebook check failed: {e}")
+            # Browser may have crashed — relaunch it on the next cycle
+            await self._close_browser()
 
         return items
 
-    def _get_dms(self, page) -> list:
+    async def _ensure_browser(self, async_playwright):
+        """Launch the browser once and return its two pages.
+
+        Chromium start-up and session load are paid on the first cycle only;
+        later cycles just navigate the already-open notification and DM tabs.
+        The login comes from state.json, not the profile directory, so the
+        orchestrator's post_to_page / send_messenger_reply can run meanwhile.
+        """
+        if self._ctx is None:
+            self._pw = await async_playwright().start()
+            self._browser, self._ctx = await new_context_async(
+                self._pw, self.session_path, args=CHROMIUM_ARGS
+            )
+            self._page = await self._ctx.new_page()
+            self._dm_page = await self._ctx.new_page()
+        return self._page, self._dm_page
+
+    async def _close_browser(self):
+        """Close the long-lived browser and Playwright driver, ignoring errors.
+
+        The session's cookies are saved first, so tokens Facebook rotated
+        while the browser was open carry over.
+        """
+        if self._ctx is not None:
+            try:
+                await save_storage_state_async(self._ctx, self.session_path)
+            except Exception:
+                pass
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception:
+                pass
+        if self._pw is not None:
+            try:
+                await self._pw.stop()
+            except Exception:
+                pass
+        self._pw = None
+        self._browser = None
+        self._ctx = None
+        self._page = None
+        self._dm_page = None
+
+    def run(self):
+        """Run the polling loop, closing the shared browser on exit."""
+        try:
+            super().run()
+        finally:
+            if self._loop is not None:
+                self._loop.run_until_complete(self._close_browser())
+                self._loop.close()
+                self._loop = None
+
+    def _send_reply(self, sender: str, reply_text: str) -> dict:
+        """Send a Messenger reply, reusing the watcher's open browser if any."""
+        if self._dm_page is None:
+            return FacebookWatcher.send_messenger_reply(
+                str(self.session_path), sender=sender, reply_text=reply_text
+            )
+        try:
+            return self._loop.run_until_complete(
+                self._send_reply_on_page(self._dm_page, sender, reply_text)
+            )
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    async def _get_dms(self, page) -> list:
         """Scrape unread Messenger threads and return them as items."""
         items = []
         try:
-            page.goto("https://www.facebook.com/messages/", wait_until="domcontentloaded", timeout=30000)
-            page.wait_for_timeout(4000)
+            await page.goto("https://www.facebook.com/messages/", wait_until="domcontentloaded", timeout=30000)
+            await page.wait_for_timeout(4000)
 
             THREAD_SELECTORS = [
                 '[role="row"]',
@@ -146,7 +319,7 @@ class FacebookWatcher(BaseWatcher):
             ]
             threads = []
             for sel in THREAD_SELECTORS:
-                found = page.query_selector_all(sel)
+                found = await page.query_selector_all(sel)
                 if found:
                     threads = found
                     logger.info(f"Facebook DMs: found {len(found)} threads with selector '{sel}'")
@@ -158,19 +331,18 @@ class FacebookWatcher(BaseWatcher):
 
             for thread in threads[:10]:
                 try:
-                    text = thread.inner_text().strip()
+                    text = (await thread.inner_text()).strip()
                     if not text:
                         continue
-                    thread_id = f"fb_dm_{hash(text) & 0xFFFFFF:06x}"
-                    if thread_id in self._processed_ids:
+                    thread_id = f"fb_dm_{content_id(text)}"
+                    if thread_id in self._bloom and thread_id in self._processed_ids:
                         continue
-                    # Extract a rough sender name from first line of thread text
-                    sender = text.split("\n")[0].strip()[:80] if "\n" in text else text[:80]
-                    keywords_found = [kw for kw in BUSINESS_KEYWORDS if kw in text.lower()]
+                    # One pass: snippet, rough sender name (first line), keywords
+                    snippet, sender, keywords_found = scan_message(text, _KEYWORD_MATCHER)
                     items.append({
                         "type": "dm",
                         "id": thread_id,
-                        "text": text[:500],
+                        "text": snippet,
                         "sender": sender,
                         "keywords": keywords_found,
                         "timestamp": datetime.now().isoformat(),
@@ -181,68 +353,84 @@ class FacebookWatcher(BaseWatcher):
             logger.warning(f"Could not fetch Facebook DMs: {e}")
         return items
 
-    def _get_notifications(self, page) -> list:
+    # Notification selectors tried in order — Facebook's DOM changes frequently
+    NOTIF_SELECTORS = [
+        '[role="article"]',
+        '[role="listitem"]',
+        '[data-pagelet="Notifications"] a',
+        'div[aria-label*="notification" i]',
+        'div[aria-label*="Notification" i]',
+        'div[data-store-id] a',
+        # Generic feed item fallback
+        'div[class*="notif"] a',
+    ]
+
+    async def _get_notifications(self, page) -> list:
         items = []
         try:
-            page.goto(FB_NOTIFICATIONS_URL, wait_until="domcontentloaded", timeout=30000)
-            page.wait_for_timeout(4000)
-
-            # Try multiple selectors — Facebook's DOM changes frequently
-            SELECTORS = [
-                '[role="article"]',
-                '[role="listitem"]',
-                '[data-pagelet="Notifications"] a',
-                'div[aria-label*="notification" i]',
-                'div[aria-label*="Notification" i]',
-                'div[data-store-id] a',
-                # Generic feed item fallback
-                'div[class*="notif"] a',
-            ]
+            await page.goto(FB_NOTIFICATIONS_URL, wait_until="domcontentloaded", timeout=30000)
+            await page.wait_for_timeout(4000)
+
+            # The selector that matched last cycle is tried first, so a
+            # stable DOM costs one probe instead of walking the whole list.
+            selectors = self.NOTIF_SELECTORS
+            if self._notif_selector in selectors:
+                selectors = [self._notif_selector] + [
+                    sel for sel in selectors if sel != self._notif_selector
+                ]
 
-            notif_items = []
+            # One round-trip per selector returns the first 15 matches with
+            # their texts and keyword hits, instead of an ElementHandle +
+            # inner_text() call each and a Python-side keyword scan.
+            results = []
             used_selector = None
-            for sel in SELECTORS:
-                found = page.query_selector_all(sel)
+            for sel in selectors:
+                found = await page.eval_on_selector_all(sel, _NOTIF_SCAN_JS, _NOTIF_SCAN_ARG)
                 if found:
-                    notif_items = found
+                    results = found
                     used_selector = sel
                     logger.info(f"Facebook: found {len(found)} items with selector '{sel}'")
                     break
 
-            if not notif_items:
+            if used_selector and used_selector != self._notif_selector:
+                self._notif_selector = used_selector
+                self._save_state()
+
+            if not results:
                 # Debug: log what's on the page so we can pick the right selector
                 try:
-                    body_text = page.inner_text("body")
+                    body_text = await page.inner_text("body")
+                    title = await page.title()
                     logger.warning(
                         f"Facebook: no notification items found with any selector. "
-                        f"Page title: '{page.title()}'. "
+                        f"Page title: '{title}'. "
                         f"Body snippet: {body_text[:300]!r}"
                     )
                 except Exception:
                     logger.warning("Facebook: no notification items found and could not read body.")
                 return items
 
-            logger.debug(f"Facebook: using selector '{used_selector}', processing {min(15, len(notif_items))} items")
+            logger.debug(f"Facebook: using selector '{used_selector}', processing {len(results)} items")
 
-            for notif in notif_items[:15]:
-                try:
-                    text = notif.inner_text().strip()
-                    if not text:
-                        continue
-                    notif_id = f"fb_{hash(text) & 0xFFFFFF:06x}"
-                    if notif_id in self._processed_ids:
-                        continue
-
-                    keywords_found = [kw for kw in BUSINESS_KEYWORDS if kw in text.lower()]
-                    items.append({
-                        "type": "notification",
-                        "id": notif_id,
-                        "text": text[:500],
-                        "keywords": keywords_found,
-                        "timestamp": datetime.now().isoformat(),
-                    })
-                except Exception:
+            for result in results:
+                text = result["text"]
+                if not text:
+                    continue
+                # Strict mode: no keywords means no action file, so don't
+                # bother hashing or de-duplicating it either.
+                if self.strict_mode and not result["keywords"]:
                     continue
+                notif_id = f"fb_{content_id(text)}"
+                if notif_id in self._bloom and notif_id in self._processed_ids:
+                    continue
+
+                items.append({
+                    "type": "notification",
+                    "id": notif_id,
+                    "text": text[:500],
+                    "keywords": result["keywords"],
+                    "timestamp": datetime.now().isoformat(),
+                })
         except Exception as e:
             logger.warning(f"Could not fetch Facebook notifications: {e}")
         return items
@@ -269,9 +457,7 @@ class FacebookWatcher(BaseWatcher):
             if self.dry_run:
                 logger.info(f"[DRY RUN] Would auto-reply to Facebook DM from: {sender}")
             else:
-                result = FacebookWatcher.send_messenger_reply(
-                    str(self.session_path), sender=sender, reply_text=FACEBOOK_AUTO_REPLY
-                )
+                result = self._send_reply(sender, FACEBOOK_AUTO_REPLY)
                 success = result.get("success", False)
                 done_file.write_text(
                     f"---\ntype: facebook_auto_replied\nsender: {sender}\n"
@@ -283,8 +469,7 @@ class FacebookWatcher(BaseWatcher):
                     "sender": sender, "success": success, "file": filename,
                 })
 
-            self._processed_ids.add(item["id"])
-            self._save_processed()
+            self._save_processed(item["id"])
             return done_file
         # ───────────────────────────────────────────────────────────────────
 
@@ -314,8 +499,7 @@ keywords_detected: {", ".join(keywords) if keywords else "none"}
 """
         filepath = self.needs_action / filename
         filepath.write_text(content)
-        self._processed_ids.add(item["id"])
-        self._save_processed()
+        self._save_processed(item["id"])
 
         self.log_event("facebook_item_detected", {
             "item_type": item["type"],
@@ -332,8 +516,10 @@ keywords_detected: {", ".join(keywords) if keywords else "none"}
             logger.info(f"[DRY RUN] Would post to Facebook: {text[:80]}...")
             return {"success": True, "dry_run": True, "text": text}
 
-        if not PLAYWRIGHT_AVAILABLE:
+        pw = _load_playwright()
+        if pw is None:
             return {"success": False, "error": "Playwright not available"}
+        sync_playwright, _, _ = pw
 
         session = Path(session_path)
         if not session.exists():
@@ -341,12 +527,8 @@ keywords_detected: {", ".join(keywords) if keywords else "none"}
 
         try:
             with sync_playwright() as p:
-                browser = p.chromium.launch_persistent_context(
-                    str(session),
-                    headless=True,
-                    args=["--no-sandbox"],
-                )
-                page = browser.pages[0] if browser.pages else browser.new_page()
+                browser, context = new_context(p, session, args=CHROMIUM_ARGS)
+                page = context.new_page()
                 target_url = page_url or FB_URL
                 page.goto(target_url, wait_until="domcontentloaded", timeout=30000)
                 page.wait_for_timeout(3000)
@@ -388,81 +570,96 @@ keywords_detected: {", ".join(keywords) if keywords else "none"}
         and sends the reply text.
 
         Args:
-            session_path: Path to persistent Chromium session directory
+            session_path: Session directory holding state.json
             sender:       Display name of the conversation sender
             reply_text:   Text to send as the reply
 
         Returns:
             dict with "success" bool and optional "error" key
         """
-        if not PLAYWRIGHT_AVAILABLE:
+        pw = _load_playwright()
+        if pw is None:
             return {"success": False, "error": "Playwright not available"}
+        _, async_playwright, _ = pw
 
         session = Path(session_path)
         if not session.exists():
             return {"success": False, "error": f"Session not found: {session_path}"}
 
+        async def _send():
+            async with async_playwright() as p:
+                browser, context = await new_context_async(p, session, args=CHROMIUM_ARGS)
+                page = await context.new_page()
+                result = await cls._send_reply_on_page(page, sender, reply_text)
+                await browser.close()
+                return result
+
         try:
-            with sync_playwright() as p:
-                browser = p.chromium.launch_persistent_context(
-                    str(session),
-                    headless=True,
-                    args=["--no-sandbox", "--disable-dev-shm-usage"],
-                )
-                page = browser.pages[0] if browser.pages else browser.new_page()
-                page.goto("https://www.facebook.com/messages/", wait_until="domcontentloaded", timeout=30000)
-                page.wait_for_timeout(4000)
-
-                # Find conversation thread by sender name
-                THREAD_SELECTORS = [
-                    '[role="row"]',
-                    '[role="listitem"]',
-                    'div[data-testid="mwthreadlist-item"]',
-                    'a[href*="/messages/t/"]',
-                ]
-                target_thread = None
-                for sel in THREAD_SELECTORS:
-                    threads = page.query_selector_all(sel)
-                    for thread in threads:
-                        try:
-                            if sender.lower() in thread.inner_text().lower():
-                                target_thread = thread
-                                break
-                        except Exception:
-                            continue
-                    if target_thread:
-                        break
+            return asyncio.run(_send())
+        except Exception as e:
+            return {"success": False, "error": str(e)}
 
-                if not target_thread:
-                    browser.close()
-                    return {"success": False, "error": f"Thread for '{sender}' not found"}
+    @staticmethod
+    async def _send_reply_on_page(page, sender: str, reply_text: str) -> dict:
+        """Find the thread for ``sender`` on an open page and send the reply."""
+        _, _, PlaywrightTimeout = _load_playwright()
+        await page.goto("https://www.facebook.com/messages/", wait_until="domcontentloaded", timeout=30000)
+        await page.wait_for_timeout(4000)
+
+        # Find conversation thread by sender name
+        THREAD_SELECTORS = [
+            '[role="row"]',
+            '[role="listitem"]',
+            'div[data-testid="mwthreadlist-item"]',
+            'a[href*="/messages/t/"]',
+        ]
+        sender_lower = sender.lower()
+        target_thread = None
+        for sel in THREAD_SELECTORS:
+            threads = await page.query_selector_all(sel)
+            for thread in threads:
+                try:
+                    if sender_lower in (await thread.inner_text()).lower():
+                        target_thread = thread
+                        break
+                except Exception:
+                    continue
+            if target_thread:
+                break
 
-                target_thread.click()
-                page.wait_for_timeout(2000)
+        if not target_thread:
+            return {"success": False, "error": f"Thread for '{sender}' not found"}
 
-                # Find message input box
-                input_box = page.query_selector('[contenteditable="true"][role="textbox"]')
-                if not input_box:
-                    browser.close()
-                    return {"success": False, "error": "Message input box not found"}
+        await target_thread.click()
+        await page.wait_for_timeout(2000)
 
-                input_box.fill(reply_text)
-                page.wait_for_timeout(500)
-                page.keyboard.press("Enter")
-                page.wait_for_timeout(2000)
+        # Find message input box
+        input_box = await page.query_selector('[contenteditable="true"][role="textbox"]')
+        if not input_box:
+            return {"success": False, "error": "Message input box not found"}
 
-                browser.close()
-                logger.info(f"Facebook Messenger reply sent to: {sender}")
-                return {"success": True, "sender": sender}
+        await input_box.fill(reply_text)
+        # Wait for Messenger's GraphQL send to be acked instead of a
+        # fixed sleep — returns as soon as the server confirms.
+        try:
+            async with page.expect_response(
+                lambda r: "/api/graphql/" in r.url and r.status == 200,
+                timeout=5000,
+            ):
+                await page.keyboard.press("Enter")
+        except PlaywrightTimeout:
+            return {"success": False, "error": "Send not confirmed by Messenger"}
 
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+        logger.info(f"Facebook Messenger reply sent to: {sender}")
+        return {"success": True, "sender": sender}
 
 
 def setup_session(vault_path: str, session_path: str):
-    if not PLAYWRIGHT_AVAILABLE:
+    pw = _load_playwright()
+    if pw is None:
         print("ERROR: Playwright not installed.")
         sys.exit(1)
+    sync_playwright, _, _ = pw
 
     session = Path(session_path)
     session.mkdir(parents=True, exist_ok=True)
@@ -479,6 +676,7 @@ def setup_session(vault_path: str, session_path: str):
         page = browser.pages[0] if browser.pages else browser.new_page()
         page.goto(FB_URL)
         input("\nPress ENTER after logging in to Facebook...\n")
+        save_storage_state(browser, session)
         browser.close()
 
     print(f"Session saved to: {session}")
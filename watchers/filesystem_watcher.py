@@ -12,23 +12,34 @@ This is the Bronze Tier watcher — no external API keys required.
 """
 
 import os
+import re
 import sys
 import shutil
 import argparse
 import logging
+import threading
+from collections import OrderedDict, namedtuple
 from pathlib import Path
 from datetime import datetime
 
 import time
 import platform
 
-from watchdog.observers import Observer
-from watchdog.observers.polling import PollingObserver
-from watchdog.events import FileSystemEventHandler
+try:
+    from watchfiles import watch, Change  # Rust notify backend — optional
+    WATCHFILES_AVAILABLE = True
+except ImportError:
+    WATCHFILES_AVAILABLE = False
+
+try:
+    from inotify_simple import INotify, flags as inotify_flags  # optional
+    INOTIFY_AVAILABLE = True
+except ImportError:
+    INOTIFY_AVAILABLE = False
 
 # Add parent dir to path if running standalone
 sys.path.insert(0, str(Path(__file__).parent))
-from base_watcher import BaseWatcher
+from base_watcher import BaseWatcher, append_log_entry
 
 
 def _is_wsl() -> bool:
@@ -40,14 +51,24 @@ def _is_wsl() -> bool:
         return False
 
 
-def _get_observer() -> Observer:
+def _needs_polling() -> bool:
+    """inotify is unreliable on WSL2 Windows mounts and absent on Windows."""
+    return _is_wsl() or platform.system() == "Windows"
+
+
+def _get_observer():
     """
     Choose the right watchdog observer for the current OS.
     On WSL2 with Windows-mounted paths (/mnt/...), inotify fails silently.
     PollingObserver works universally but uses more CPU.
+
+    watchdog is imported here rather than at module level, so --help and
+    the watchfiles/inotify backends never load it.
     """
-    if _is_wsl() or platform.system() == "Windows":
+    if _needs_polling():
+        from watchdog.observers.polling import PollingObserver
         return PollingObserver(timeout=2)
+    from watchdog.observers import Observer
     return Observer()
 
 # Dry-run mode: set DRY_RUN=true in environment to prevent file operations
@@ -59,6 +80,13 @@ ALLOWED_EXTENSIONS = {
     ".csv", ".xlsx", ".docx", ".json", ".zip"
 }
 
+# A new file is processed only once its size has stopped changing for this
+# long, so large copies aren't picked up half-written.
+DEBOUNCE_SECONDS = 0.5
+
+# Most recent inbox paths remembered for de-duplication
+MAX_PROCESSED = 10_000
+
 # Priority keywords in filenames
 PRIORITY_KEYWORDS = {
     "urgent": "P0",
@@ -71,14 +99,46 @@ PRIORITY_KEYWORDS = {
     "report": "P2",
 }
 
+# All keywords in one case-insensitive pattern. The lookahead reports a hit
+# at every position, and alternation order = dict order, so the earliest
+# keyword in PRIORITY_KEYWORDS still wins exactly as in a linear scan.
+_PRIORITY_RE = re.compile(
+    "(?=(" + "|".join(re.escape(kw) for kw in PRIORITY_KEYWORDS) + "))",
+    re.IGNORECASE,
+)
+_PRIORITY_ORDER = {kw: i for i, kw in enumerate(PRIORITY_KEYWORDS)}
+
 
 def detect_priority(filename: str) -> str:
     """Detect priority based on filename keywords."""
-    lower = filename.lower()
-    for keyword, priority in PRIORITY_KEYWORDS.items():
-        if keyword in lower:
-            return priority
-    return "P3"  # Default: low priority
+    hits = {m.group(1).lower() for m in _PRIORITY_RE.finditer(filename)}
+    if not hits:
+        return "P3"  # Default: low priority
+    return PRIORITY_KEYWORDS[min(hits, key=_PRIORITY_ORDER.__getitem__)]
+
+
+def copy_file(source: Path, dest: Path):
+    """
+    Copy a file's contents and metadata (like shutil.copy2).
+
+    On Linux the data is moved in-kernel with os.copy_file_range, which can
+    reflink on btrfs/xfs, so large PDFs/zips never pass through Python
+    buffers. Elsewhere, or if the call is refused (cross-device, old kernel),
+    falls back to shutil.copyfile, which still uses sendfile where it can.
+    """
+    try:
+        with open(source, "rb") as src, open(dest, "wb") as dst:
+            remaining = os.fstat(src.fileno()).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+            if remaining > 0:
+                raise OSError("copy_file_range stopped early")
+    except (AttributeError, OSError):
+        shutil.copyfile(source, dest)
+    shutil.copystat(source, dest)
 
 
 def detect_file_type(suffix: str) -> str:
@@ -99,7 +159,57 @@ def detect_file_type(suffix: str) -> str:
     return types.get(suffix.lower(), "file")
 
 
-class InboxDropHandler(FileSystemEventHandler):
+# Action file body, filled in per drop with str.format_map
+_ACTION_TEMPLATE = """---
+type: file_drop
+source: inbox
+original_name: {name}
+file_type: {file_type}
+file_size_bytes: {file_size}
+received: {received}
+priority: {priority}
+status: pending
+assigned_to: claude_code
+---
+
+## File Received: {name}
+
+A new **{file_type}** file has been dropped into the Inbox.
+
+| Field | Value |
+|-------|-------|
+| Original Name | `{name}` |
+| Type | {file_type} |
+| Size | {file_size:,} bytes |
+| Priority | {priority} |
+| Received | {received_display} |
+| Copied To | `Needs_Action/{dest_name}` |
+
+## Suggested Actions
+
+- [ ] Review file contents
+- [ ] Categorize and tag appropriately
+- [ ] Take action based on file type:
+  - If **document/contract**: summarize and flag for review
+  - If **invoice**: extract amount and log to Accounting
+  - If **data/spreadsheet**: analyze and report key metrics
+  - If **image**: describe and categorize
+- [ ] Move to `/Done/` when complete
+
+## Notes
+
+_Add your notes here after review._
+
+---
+*Created by: FileSystemWatcher · Bronze Tier*
+"""
+
+
+# Minimal stand-in for a watchdog file event, used by the non-watchdog backends
+_FileEvent = namedtuple("_FileEvent", ["src_path", "is_directory"])
+
+
+class InboxDropHandler:
     """
     Watchdog event handler for the /Inbox drop folder.
 
@@ -116,7 +226,19 @@ class InboxDropHandler(FileSystemEventHandler):
         self.logs_dir = self.vault_path / "Logs"
         self.dry_run = dry_run
         self.logger = logging.getLogger("InboxDropHandler")
-        self._processed = set()  # Track processed files to avoid duplicates
+        # Track processed files to avoid duplicates. Bounded, oldest evicted
+        # first, so a long-running watcher doesn't keep every path forever.
+        self._processed = OrderedDict()
+        # Files waiting for their size to settle: path -> debounce Timer
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def dispatch(self, event):
+        """Route a watchdog event (observers only ever call dispatch())."""
+        if event.event_type == "created":
+            self.on_created(event)
+        elif event.event_type == "modified":
+            self.on_modified(event)
 
     def on_created(self, event):
         """Handle new file creation in /Inbox."""
@@ -134,13 +256,63 @@ class InboxDropHandler(FileSystemEventHandler):
         if str(source) in self._processed:
             return
 
-        self._processed.add(str(source))
+        self._schedule(source)
+
+    def on_modified(self, event):
+        """Restart the debounce while a pending file is still being written."""
+        if not event.is_directory and str(event.src_path) in self._pending:
+            self._schedule(Path(event.src_path))
+
+    def _schedule(self, source: Path, size: int = None):
+        """(Re)start the debounce timer for a file, cancelling any earlier one.
+
+        The window is measured from the file's current size, so a file that
+        is already complete is processed after a single debounce round.
+        """
+        key = str(source)
+        if size is None:
+            try:
+                size = source.stat().st_size
+            except OSError:
+                return  # removed or renamed before it could be scheduled
+        with self._lock:
+            timer = self._pending.get(key)
+            if timer is not None:
+                timer.cancel()
+            timer = threading.Timer(DEBOUNCE_SECONDS, self._maybe_process, args=(source, size))
+            timer.daemon = True
+            self._pending[key] = timer
+            timer.start()
+
+    def _maybe_process(self, source: Path, size: int):
+        """Process the file if its size held steady over the debounce window."""
+        key = str(source)
+        try:
+            current = source.stat().st_size
+        except OSError:
+            # Removed or renamed before it settled
+            with self._lock:
+                self._pending.pop(key, None)
+            return
+        if current != size:
+            self._schedule(source, current)
+            return
+
+        with self._lock:
+            self._pending.pop(key, None)
+            if key in self._processed:
+                return
+            self._processed[key] = None
+            if len(self._processed) > MAX_PROCESSED:
+                self._processed.popitem(last=False)
+
         self.logger.info(f"New file detected: {source.name}")
         self._process_file(source)
 
     def _process_file(self, source: Path):
         """Process a dropped file: copy it and create an action file."""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        now = datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
         priority = detect_priority(source.name)
         file_type = detect_file_type(source.suffix)
         file_size = source.stat().st_size if source.exists() else 0
@@ -155,57 +327,22 @@ class InboxDropHandler(FileSystemEventHandler):
 
         # Copy the original file to Needs_Action
         try:
-            shutil.copy2(source, dest_file)
+            copy_file(source, dest_file)
             self.logger.info(f"Copied to Needs_Action: {dest_file.name}")
         except Exception as e:
             self.logger.error(f"Failed to copy file: {e}")
             return
 
         # Create the .md action file
-        action_content = f"""---
-type: file_drop
-source: inbox
-original_name: {source.name}
-file_type: {file_type}
-file_size_bytes: {file_size}
-received: {datetime.now().isoformat()}
-priority: {priority}
-status: pending
-assigned_to: claude_code
----
-
-## File Received: {source.name}
-
-A new **{file_type}** file has been dropped into the Inbox.
-
-| Field | Value |
-|-------|-------|
-| Original Name | `{source.name}` |
-| Type | {file_type} |
-| Size | {file_size:,} bytes |
-| Priority | {priority} |
-| Received | {datetime.now().strftime("%Y-%m-%d %H:%M:%S")} |
-| Copied To | `Needs_Action/{dest_file.name}` |
-
-## Suggested Actions
-
-- [ ] Review file contents
-- [ ] Categorize and tag appropriately
-- [ ] Take action based on file type:
-  - If **document/contract**: summarize and flag for review
-  - If **invoice**: extract amount and log to Accounting
-  - If **data/spreadsheet**: analyze and report key metrics
-  - If **image**: describe and categorize
-- [ ] Move to `/Done/` when complete
-
-## Notes
-
-_Add your notes here after review._
-
----
-*Created by: FileSystemWatcher · Bronze Tier*
-"""
-        action_file.write_text(action_content)
+        action_file.write_text(_ACTION_TEMPLATE.format_map({
+            "name": source.name,
+            "file_type": file_type,
+            "file_size": file_size,
+            "received": now.isoformat(),
+            "received_display": now.strftime("%Y-%m-%d %H:%M:%S"),
+            "priority": priority,
+            "dest_name": dest_file.name,
+        }))
         self.logger.info(f"Created action file: {action_file.name}")
 
         # Log the event
@@ -213,8 +350,6 @@ _Add your notes here after review._
 
     def _log_event(self, source: Path, dest: Path, action_file: Path, priority: str):
         """Write a structured log entry."""
-        import json
-
         today = datetime.now().strftime("%Y-%m-%d")
         log_file = self.logs_dir / f"{today}.json"
 
@@ -228,16 +363,7 @@ _Add your notes here after review._
             "priority": priority,
             "result": "action_file_created",
         }
-
-        entries = []
-        if log_file.exists():
-            try:
-                entries = json.loads(log_file.read_text())
-            except json.JSONDecodeError:
-                entries = []
-
-        entries.append(entry)
-        log_file.write_text(json.dumps(entries, indent=2))
+        append_log_entry(log_file, entry)
 
 
 class FileSystemWatcher(BaseWatcher):
@@ -266,13 +392,92 @@ class FileSystemWatcher(BaseWatcher):
         """Not used directly — handler creates files via on_created callback."""
         pass
 
+    def _watchfiles_loop(self, handler: InboxDropHandler, stop: threading.Event):
+        """Feed watchfiles change batches into the handler as file events.
+
+        The directory scan/notify loop runs in watchfiles' Rust thread and
+        wakes Python only when something actually changed.
+        """
+        for changes in watch(self.inbox, step=200, stop_event=stop, recursive=False):
+            for change, path in changes:
+                if change == Change.added:
+                    handler.on_created(_FileEvent(path, False))
+                elif change == Change.modified:
+                    handler.on_modified(_FileEvent(path, False))
+
+    def _run_watchfiles(self, handler: InboxDropHandler):
+        """Run the watchfiles backend until interrupted."""
+        self.logger.info("Using watchfiles backend (WSL2/Windows filesystem detected).")
+        stop = threading.Event()
+        thread = threading.Thread(
+            target=self._watchfiles_loop, args=(handler, stop), daemon=True
+        )
+        thread.start()
+
+        self.log_event("watcher_started", {
+            "watching": str(self.inbox),
+            "dry_run": self.dry_run,
+        })
+
+        try:
+            while thread.is_alive():
+                time.sleep(1)
+        except KeyboardInterrupt:
+            self.logger.info("Shutdown requested. Stopping watcher.")
+            stop.set()
+
+        thread.join()
+        self.log_event("watcher_stopped", {"reason": "keyboard_interrupt"})
+        self.logger.info("FileSystemWatcher stopped.")
+
+    def _run_inotify(self, handler: InboxDropHandler):
+        """Run a single inotify watch on /Inbox until interrupted.
+
+        One read() returns every packed event queued since the last one,
+        without watchdog's emitter thread and event queue in between.
+        Only arrivals are watched; the handler's debounce re-checks the size
+        until the write has finished.
+        """
+        self.logger.info("Using inotify_simple backend (native Linux).")
+        inotify = INotify()
+        inotify.add_watch(str(self.inbox), inotify_flags.CREATE | inotify_flags.MOVED_TO)
+
+        self.log_event("watcher_started", {
+            "watching": str(self.inbox),
+            "dry_run": self.dry_run,
+        })
+
+        try:
+            while True:
+                for event in inotify.read(timeout=1000):
+                    if event.mask & inotify_flags.ISDIR:
+                        continue
+                    handler.on_created(_FileEvent(str(self.inbox / event.name), False))
+        except KeyboardInterrupt:
+            self.logger.info("Shutdown requested. Stopping watcher.")
+        finally:
+            inotify.close()
+
+        self.log_event("watcher_stopped", {"reason": "keyboard_interrupt"})
+        self.logger.info("FileSystemWatcher stopped.")
+
     def run(self):
         """Start the watchdog observer (with WSL2/Windows polling fallback)."""
         self.logger.info(f"Monitoring /Inbox at: {self.inbox}")
         self.logger.info("Drop files into /Inbox to trigger AI processing.")
 
+        if WATCHFILES_AVAILABLE and _needs_polling():
+            handler = InboxDropHandler(str(self.vault_path), dry_run=self.dry_run)
+            self._run_watchfiles(handler)
+            return
+
+        if INOTIFY_AVAILABLE and platform.system() == "Linux" and not _is_wsl():
+            handler = InboxDropHandler(str(self.vault_path), dry_run=self.dry_run)
+            self._run_inotify(handler)
+            return
+
         observer_cls = _get_observer()
-        if isinstance(observer_cls, PollingObserver):
+        if _needs_polling():
             self.logger.info("Using PollingObserver (WSL2/Windows filesystem detected).")
 
         handler = InboxDropHandler(str(self.vault_path), dry_run=self.dry_run)
@@ -11,35 +11,104 @@ Setup:
   1. Enable Gmail API at console.cloud.google.com
   2. Create OAuth 2.0 credentials (Desktop app)
   3. Download credentials.json to this directory
-  4. Run once interactively to authorize: python gmail_watcher.py --setup
+  4. Run once interactively to authorize (the first run opens the OAuth flow)
   5. Then run normally: python gmail_watcher.py --vault ./AI_Employee_Vault
 
 Environment variables:
   GMAIL_CREDENTIALS_PATH  Path to credentials.json (default: ./credentials.json)
   GMAIL_TOKEN_PATH        Path to token.json (default: ./token.json)
+  GMAIL_PUBSUB_TOPIC      projects/<project>/topics/<topic> — enables push mode
+  GMAIL_PUBSUB_SUBSCRIPTION  projects/<project>/subscriptions/<sub> for that topic
   DRY_RUN=true            Log actions without creating files
+
+Push mode (optional, pip install google-cloud-pubsub):
+  With both GMAIL_PUBSUB_* variables set, Gmail publishes mailbox changes to
+  the topic (grant gmail-api-push@system.gserviceaccount.com publish rights)
+  and the watcher pulls them instead of polling messages.list. Pub/Sub uses
+  Application Default Credentials. Falls back to polling if unavailable.
 """
 
 import os
 import sys
 import json
+import asyncio
+import threading
+import time
+import queue
 import argparse
+import base64
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
+from email.header import Header
+from email.utils import formataddr, parseaddr
 
 # Add parent dir to path
 sys.path.insert(0, str(Path(__file__).parent))
-from base_watcher import BaseWatcher
+from base_watcher import BaseWatcher, write_atomic
+from retry_handler import TransientError, with_retry
+from bloom_filter import RotatingBloomFilter
+from keyword_matcher import WordMatcher
+
+try:
+    import orjson  # optional — faster state-file (de)serialization
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 DRY_RUN = os.getenv("DRY_RUN", "false").lower() == "true"
 
-# gmail.send is needed for auto-reply.  Adding it requires re-running --setup
-# once to re-authorize (delete watchers/token.json to force re-auth).
+# gmail.send is needed for auto-reply, gmail.modify to mark auto-replied mail
+# read.  Only a new authorization asks for these; an existing token keeps the
+# scopes it was granted (delete watchers/token.json and restart to re-authorize).
+MODIFY_SCOPE = "https://www.googleapis.com/auth/gmail.modify"
 SCOPES = [
     "https://www.googleapis.com/auth/gmail.readonly",
     "https://www.googleapis.com/auth/gmail.send",
+    MODIFY_SCOPE,
 ]
 
+METADATA_HEADERS = ["From", "Subject", "Date", "To", "Message-ID"]
+
+# Partial-response projections: only the fields the watcher reads go over the wire
+LIST_FIELDS = "messages(id,threadId)"
+METADATA_FIELDS = "id,threadId,labelIds,snippet,payload/headers"
+
+# Gmail accepts at most 100 calls in one batch request
+BATCH_SIZE = 100
+
+# Processed message IDs live in a two-generation Bloom filter (~300 KB on
+# disk) that rotates every PROCESSED_CAPACITY IDs, so the last 50k are always
+# remembered and a new message is mistaken for a seen one ~1 in 50k times.
+PROCESSED_CAPACITY = 50_000
+PROCESSED_ERROR_RATE = 1e-5
+# Adaptive polling: aim for POLLS_PER_ARRIVAL polls per expected gap between
+# new mail, within these bounds (far below Gmail's per-second quota).
+MIN_POLL_INTERVAL = 30
+MAX_POLL_INTERVAL = 600
+POLLS_PER_ARRIVAL = 4
+
+# Rate-limit and server errors worth retrying with backoff
+RETRYABLE_STATUS = {429, 500, 502, 503}
+
+# Messages handled concurrently per cycle (auto-reply sends are network-bound)
+MAX_CONCURRENCY = 10
+
+# Socket timeout for Gmail API connections, in seconds
+HTTP_TIMEOUT = 30
+
+# Push mode: Pub/Sub topic/subscription for users.watch notifications
+PUBSUB_TOPIC = os.getenv("GMAIL_PUBSUB_TOPIC", "")
+PUBSUB_SUBSCRIPTION = os.getenv("GMAIL_PUBSUB_SUBSCRIPTION", "")
+# A watch expires after 7 days; Google recommends renewing it daily
+WATCH_RENEW_SECONDS = 24 * 3600
+# In push mode a poll is only a local queue drain, so it can run often
+PUSH_DRAIN_INTERVAL = 5
+
+# New IDs are appended to a log, folded into the filter snapshot this often
+COMPACT_EVERY = 500
+
 # Keywords that flag an email as needing human review / Claude processing.
 # Emails whose snippet contains NONE of these get an auto-reply instead.
 BUSINESS_KEYWORDS = [
@@ -57,6 +126,10 @@ BUSINESS_KEYWORDS = [
     "dispute", "complaint", "issue", "problem", "broken", "outage",
 ]
 
+# Matched as whole words or plurals: "fee" flags "fees" but not "coffee" or "feedback"
+_KEYWORD_MATCHER = WordMatcher(BUSINESS_KEYWORDS)
+
+
 # Auto-reply text for low-priority emails.  Override via GMAIL_AUTO_REPLY in .env
 GMAIL_AUTO_REPLY = os.getenv(
     "GMAIL_AUTO_REPLY",
@@ -65,39 +138,262 @@ GMAIL_AUTO_REPLY = os.getenv(
     "and I'll prioritise it accordingly.",
 )
 
+# Auto-reply message pre-serialized once; only To/Subject/threading headers
+# are filled in per reply (see _send_auto_reply).
+_REPLY_TEMPLATE = (
+    b"To: %b\r\nSubject: %b\r\nIn-Reply-To: %b\r\nReferences: %b\r\n"
+    b"MIME-Version: 1.0\r\nContent-Type: text/plain; charset=utf-8\r\n"
+    b"Content-Transfer-Encoding: base64\r\n\r\n"
+    + base64.encodebytes(GMAIL_AUTO_REPLY.encode()).replace(b"\n", b"\r\n")
+)
+
+
+def _header_bytes(value: str) -> bytes:
+    """Encode a header value for _REPLY_TEMPLATE (RFC 2047 if non-ASCII)."""
+    value = " ".join(value.splitlines())  # no header injection via CR/LF
+    try:
+        return value.encode("ascii")
+    except UnicodeEncodeError:
+        return Header(value, "utf-8").encode().encode("ascii")
+
+
+def _execute(request, **kwargs):
+    """Execute a Gmail API request once; 429/5xx raise TransientError.
+
+    GmailWatcher wraps this with with_retry (its self._execute) so the
+    backoff is cancelled when that watcher is stopped.
+    """
+    from googleapiclient.errors import HttpError
+
+    try:
+        return request.execute(**kwargs)
+    except HttpError as e:
+        if e.resp.status in RETRYABLE_STATUS:
+            raise TransientError(f"Gmail API HTTP {e.resp.status}: {e}") from e
+        raise
+
+
+def _load_json(path: Path):
+    """Parse a JSON state file, with orjson when installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(path.read_bytes())
+    return json.loads(path.read_bytes())
+
+
+def _dump_json(obj) -> bytes:
+    """Serialize state to JSON bytes, with orjson when installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
 
 class GmailWatcher(BaseWatcher):
     """
     Monitors Gmail for unread important messages.
 
-    Polls every 2 minutes (120 seconds) to stay within Gmail API quotas.
+    Polls every 2 minutes (120 seconds) until it has seen some mail, then
+    adapts the interval (30s-10min) to the mailbox's arrival rate.
     Only processes messages flagged as 'important' by Gmail to reduce noise.
     """
 
     def __init__(self, vault_path: str, credentials_path: str, token_path: str):
         super().__init__(vault_path, check_interval=120)
+        # API calls retry 429/5xx with backoff; stop() cancels a pending wait
+        self._execute = with_retry(
+            max_attempts=5, base_delay=1.0, max_delay=30.0, stop_event=self._stop_event
+        )(_execute)
         self.credentials_path = Path(credentials_path)
         self.token_path = Path(token_path)
-        self.processed_ids: set = self._load_processed_ids()
+        self._log_count = 0  # IDs in .gmail_state.log since the last snapshot
+        self._unsaved = None  # IDs buffered during create_action_files
+        self._pending_read = []  # auto-replied IDs to mark read after the cycle
+        self._can_mark_read = False  # token granted gmail.modify (see _init_gmail)
+        # Guards state shared by the concurrent per-message workers
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # Long-lived workers, so their keep-alive connections (see _http)
+        # are reused from one cycle to the next
+        self._pool = ThreadPoolExecutor(max_workers=MAX_CONCURRENCY)
+        self._creds = None
+        self._stamp_cycle()
+        self.processed_ids: RotatingBloomFilter = self._load_processed_ids()
         self.service = None
+        # Message metadata fetched in check_for_updates, keyed by message ID
+        self._meta_cache: dict = {}
+        # Monotonic times of recent polls that found new mail (see next_interval)
+        self._arrivals = deque(maxlen=50)
+        # Push mode state (see _start_push)
+        self._push_queue = None
+        self._subscriber = None
+        self._watch_renewed = 0.0
+        # Mailbox historyId the next history.list delta starts from
+        self._history_id = self._load_history_id()
+        self._saved_history_id = self._history_id
+        # historyId the current cycle's messages were listed up to; adopted
+        # only once all of them have been handled (see _save_history_id)
+        self._next_history_id = None
         self._init_gmail()
+        if PUBSUB_TOPIC and PUBSUB_SUBSCRIPTION:
+            self._start_push()
 
-    def _load_processed_ids(self) -> set:
-        """Load previously processed message IDs to avoid duplicates."""
-        state_file = self.vault_path / ".gmail_state.json"
-        if state_file.exists():
+    def _load_processed_ids(self) -> RotatingBloomFilter:
+        """Load previously processed message IDs to avoid duplicates.
+
+        The .gmail_state.bloom snapshot is replayed with the IDs appended to
+        .gmail_state.log since it was written. IDs from the old
+        .gmail_state.json list are folded in on first run.
+        """
+        bloom = None
+        bloom_file = self.vault_path / ".gmail_state.bloom"
+        if bloom_file.exists():
             try:
-                return set(json.loads(state_file.read_text()))
+                bloom = RotatingBloomFilter.from_bytes(
+                    bloom_file.read_bytes(), PROCESSED_CAPACITY, PROCESSED_ERROR_RATE
+                )
             except Exception:
-                return set()
-        return set()
+                pass
+        if bloom is None:
+            bloom = RotatingBloomFilter(capacity=PROCESSED_CAPACITY, error_rate=PROCESSED_ERROR_RATE)
+            state_file = self.vault_path / ".gmail_state.json"
+            if state_file.exists():
+                try:
+                    legacy = _load_json(state_file)
+                    if isinstance(legacy, list):
+                        bloom.update(legacy)
+                        # Snapshot now: .gmail_state.json is reused for the historyId
+                        write_atomic(bloom_file, bloom.to_bytes())
+                except Exception:
+                    pass
+
+        log_file = self.vault_path / ".gmail_state.log"
+        if log_file.exists():
+            ids = [line.strip() for line in log_file.read_text().splitlines() if line.strip()]
+            bloom.update(ids)
+            self._log_count = len(ids)
+        return bloom
+
+    def _load_history_id(self):
+        """Read the last historyId from .gmail_state.json (None if unknown)."""
+        state_file = self.vault_path / ".gmail_state.json"
+        try:
+            state = _load_json(state_file)
+        except Exception:
+            return None
+        return state.get("history_id") if isinstance(state, dict) else None
 
-    def _save_processed_ids(self):
-        """Persist processed IDs to avoid reprocessing after restart."""
+    def _save_history_id(self):
+        """Adopt the cycle's new historyId and persist it to .gmail_state.json.
+
+        Only called once every message listed up to it has been handled, so a
+        message that failed is listed again by the next cycle's delta.
+        """
+        if self._next_history_id is not None:
+            self._history_id, self._next_history_id = self._next_history_id, None
+        if self._history_id is None or self._history_id == self._saved_history_id:
+            return
         state_file = self.vault_path / ".gmail_state.json"
-        # Keep only last 1000 IDs to prevent unbounded growth
-        ids_list = list(self.processed_ids)[-1000:]
-        state_file.write_text(json.dumps(ids_list))
+        write_atomic(state_file, _dump_json({"history_id": self._history_id}))
+        self._saved_history_id = self._history_id
+
+    def _save_processed_ids(self, message_id: str):
+        """Mark a message processed and record it in .gmail_state.log.
+
+        Inside create_action_files the ID is buffered and the whole cycle's
+        IDs are appended in one write at the end.
+        """
+        with self._lock:
+            self.processed_ids.add(message_id)
+            if self._unsaved is not None:
+                self._unsaved.append(message_id)
+                return
+        self._append_processed_ids([message_id])
+
+    def _append_processed_ids(self, message_ids: list):
+        """Append IDs to .gmail_state.log, compacting it when due.
+
+        Every COMPACT_EVERY appended IDs the log is folded into a fresh
+        .gmail_state.bloom snapshot and truncated, so neither file grows
+        without bound and no write is proportional to the history size.
+        """
+        log_file = self.vault_path / ".gmail_state.log"
+        with open(log_file, "a") as f:
+            f.write("".join(message_id + "\n" for message_id in message_ids))
+        self._log_count += len(message_ids)
+        if self._log_count >= COMPACT_EVERY:
+            write_atomic(self.vault_path / ".gmail_state.bloom", self.processed_ids.to_bytes())
+            # Truncated only once the new snapshot is in place; a crash in
+            # between just replays IDs the snapshot already holds.
+            log_file.write_text("")
+            self._log_count = 0
+
+    def create_action_files(self, items: list) -> list:
+        """Create a cycle's action files, then persist all their IDs at once.
+
+        Messages are handled concurrently (up to MAX_CONCURRENCY) so their
+        auto-reply round trips overlap instead of running back to back.
+        """
+        self._unsaved = []
+        created = []
+        try:
+            created = asyncio.run(self._create_action_files_async(items))
+            return created
+        finally:
+            self._mark_read()
+            unsaved, self._unsaved = self._unsaved, None
+            if unsaved:
+                self._append_processed_ids(unsaved)
+            # Only advance the historyId once every message in the delta is
+            # saved; otherwise keep it so the failed ones are retried
+            if len(created) == len(items):
+                self._save_history_id()
+            else:
+                self._next_history_id = None
+                if self._push_queue is not None:
+                    self._push_queue.put(None)  # re-run the delta next drain
+
+    def _mark_read(self):
+        """Mark the cycle's auto-replied messages read with one batchModify call."""
+        ids, self._pending_read = self._pending_read, []
+        if not ids or not self._can_mark_read:
+            return
+        try:
+            # batchModify takes up to 1000 IDs; a cycle lists far fewer
+            self._execute(self.service.users().messages().batchModify(
+                userId="me",
+                body={"ids": ids, "removeLabelIds": ["UNREAD"]},
+            ))
+        except Exception as e:
+            self.logger.warning(f"Could not mark {len(ids)} auto-replied emails read: {e}")
+
+    async def _create_action_files_async(self, items: list) -> list:
+        loop = asyncio.get_running_loop()
+        # A dedicated pool, so the cap is MAX_CONCURRENCY regardless of CPU count
+        # Base loop for one item each: same logging and error handling
+        results = await asyncio.gather(*(
+            loop.run_in_executor(self._pool, BaseWatcher.create_action_files, self, [item])
+            for item in items
+        ))
+        return [path for created in results for path in created]
+
+    def _http(self):
+        """Per-thread authorized transport; httplib2 connections aren't thread-safe.
+
+        Each transport keeps its TLS connection alive, so a thread's API
+        calls after the first skip the handshake.
+        """
+        http = getattr(self._local, "http", None)
+        if http is None:
+            import httplib2
+            from google_auth_httplib2 import AuthorizedHttp
+            http = self._local.http = AuthorizedHttp(
+                self._creds, http=httplib2.Http(timeout=HTTP_TIMEOUT)
+            )
+        return http
+
+    def log_event(self, event_type: str, details: dict):
+        """Serialize log writes from the concurrent workers."""
+        with self._lock:
+            super().log_event(event_type, details)
 
     def _init_gmail(self):
         """Authenticate with Gmail API."""
@@ -109,7 +405,9 @@ class GmailWatcher(BaseWatcher):
 
             creds = None
             if self.token_path.exists():
-                creds = Credentials.from_authorized_user_file(str(self.token_path), SCOPES)
+                # Load with the scopes the token was granted: refreshing with
+                # scopes it lacks (e.g. gmail.modify) fails with invalid_scope
+                creds = Credentials.from_authorized_user_file(str(self.token_path))
 
             if not creds or not creds.valid:
                 if creds and creds.expired and creds.refresh_token:
@@ -135,7 +433,20 @@ class GmailWatcher(BaseWatcher):
                     creds = flow.run_local_server(port=0, open_browser=False)
                 self.token_path.write_text(creds.to_json())
 
-            self.service = build("gmail", "v1", credentials=creds)
+            self._can_mark_read = creds.has_scopes([MODIFY_SCOPE])
+            if not self._can_mark_read:
+                self.logger.warning(
+                    "Gmail token lacks gmail.modify; auto-replied emails stay unread. "
+                    f"Delete {self.token_path} and restart to re-authorize."
+                )
+            self._creds = creds
+            # The main thread's calls share its keep-alive transport. The
+            # discovery document comes from the copy bundled with
+            # google-api-python-client, so startup makes no discovery request.
+            self.service = build(
+                "gmail", "v1", http=self._http(),
+                static_discovery=True, cache_discovery=False,
+            )
             self.logger.info("Gmail API authenticated successfully.")
 
         except ImportError:
@@ -145,29 +456,212 @@ class GmailWatcher(BaseWatcher):
             )
             raise
 
-    def check_for_updates(self) -> list:
-        """Fetch unread important messages not yet processed."""
-        results = self.service.users().messages().list(
+    def _start_push(self):
+        """Subscribe to Gmail push notifications via users.watch + Pub/Sub.
+
+        A streaming-pull subscriber runs on Pub/Sub's background threads and
+        queues each notification; check_for_updates then only drains the
+        queue and asks history.list for the exact changes.
+        """
+        try:
+            from google.cloud import pubsub_v1
+        except ImportError:
+            self.logger.warning(
+                "GMAIL_PUBSUB_* set but google-cloud-pubsub is not installed; polling instead."
+            )
+            return
+
+        try:
+            history_id = self._renew_watch()
+            if self._history_id is None:
+                self._history_id = history_id
+            self._push_queue = queue.Queue()
+
+            def on_message(message):
+                self._push_queue.put(message.data)
+                message.ack()
+
+            self._subscriber = pubsub_v1.SubscriberClient()
+            self._subscriber.subscribe(PUBSUB_SUBSCRIPTION, callback=on_message)
+            self.logger.info(f"Gmail push mode enabled via {PUBSUB_SUBSCRIPTION}.")
+        except Exception as e:
+            self.logger.error(f"Gmail push setup failed, polling instead: {e}")
+            self._push_queue = None
+            self._subscriber = None
+
+    def _renew_watch(self) -> str:
+        """(Re)register the mailbox watch on the Pub/Sub topic; return its historyId."""
+        response = self._execute(self.service.users().watch(
+            userId="me",
+            body={
+                "topicName": PUBSUB_TOPIC,
+                "labelIds": ["IMPORTANT"],
+                "labelFilterBehavior": "INCLUDE",
+            },
+        ))
+        self._watch_renewed = time.monotonic()
+        return response["historyId"]
+
+    def _history_delta(self) -> list:
+        """Return unread important messages added since self._history_id.
+
+        The historyId the delta runs up to is held in self._next_history_id
+        until the messages have been handled.
+        """
+        messages = {}
+        page_token = None
+        while True:
+            response = self._execute(self.service.users().history().list(
+                userId="me",
+                startHistoryId=self._history_id,
+                historyTypes=["messageAdded"],
+                labelId="IMPORTANT",
+                pageToken=page_token,
+            ))
+            for record in response.get("history", []):
+                for added in record.get("messagesAdded", []):
+                    msg = added["message"]
+                    labels = msg.get("labelIds", [])
+                    if "UNREAD" in labels and "IMPORTANT" in labels:
+                        messages[msg["id"]] = {"id": msg["id"], "threadId": msg.get("threadId")}
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                self._next_history_id = response.get("historyId")
+                return list(messages.values())
+
+    def _check_push(self) -> list:
+        """Drain queued push notifications; fetch the delta only if any arrived."""
+        if time.monotonic() - self._watch_renewed > WATCH_RENEW_SECONDS:
+            self._renew_watch()
+
+        notified = False
+        while True:
+            try:
+                self._push_queue.get_nowait()
+                notified = True
+            except queue.Empty:
+                break
+        if not notified:
+            return []
+
+        try:
+            return self._history_delta()
+        except Exception as e:
+            # startHistoryId too old (404) or similar — resync with a full list
+            self.logger.warning(f"Gmail history.list failed ({e}); resyncing.")
+            self._next_history_id = self._renew_watch()
+            return self._list_unread()
+
+    def _check_history(self) -> list:
+        """Polling mode: fetch only the messages added since the last poll.
+
+        history.list returns the delta since the stored historyId, so already
+        processed mail never comes back from the server. A full messages.list
+        is only needed on first run or when the historyId has expired (404,
+        after about a week).
+        """
+        from googleapiclient.errors import HttpError
+
+        if self._history_id is not None:
+            try:
+                return self._history_delta()
+            except HttpError as e:
+                if e.resp.status != 404:
+                    raise
+                self.logger.warning("Gmail historyId expired; resyncing with a full list.")
+        # Take the historyId before listing so nothing arriving in between is missed
+        profile = self._execute(self.service.users().getProfile(userId="me", fields="historyId"))
+        self._next_history_id = profile["historyId"]
+        return self._list_unread()
+
+    def _list_unread(self) -> list:
+        """List unread important messages (the polling-mode query)."""
+        results = self._execute(self.service.users().messages().list(
             userId="me",
             q="is:unread is:important",
             maxResults=10,
-        ).execute()
+            fields=LIST_FIELDS,
+        ))
+        return results.get("messages", [])
+
+    def next_interval(self, found: int) -> float:
+        """In push mode, drain the notification queue every few seconds."""
+        if self._push_queue is not None:
+            return PUSH_DRAIN_INTERVAL
+        return self._adaptive_interval(found)
+
+    def _stamp_cycle(self):
+        """Take this cycle's clock reading once; every file in the batch shares it."""
+        now = datetime.now()
+        self._cycle_ts = now.strftime("%Y%m%d_%H%M%S")
+        self._cycle_iso = now.isoformat()
 
-        messages = results.get("messages", [])
+    def check_for_updates(self) -> list:
+        """Fetch unread important messages not yet processed."""
+        self._stamp_cycle()
+        self._next_history_id = None  # left over if the last cycle raised
+        if self._push_queue is not None:
+            messages = self._check_push()
+        else:
+            messages = self._check_history()
         new_messages = [m for m in messages if m["id"] not in self.processed_ids]
         if new_messages:
             self.logger.info(f"Found {len(new_messages)} new important messages.")
+            self._fetch_metadata(new_messages)
+        else:
+            self._save_history_id()
         return new_messages
 
+    def _fetch_metadata(self, messages: list):
+        """Fetch headers for all messages in one batched HTTP round trip.
+
+        Results land in self._meta_cache for create_action_file. A message
+        whose sub-request failed is simply left out and fetched on its own.
+        """
+        def on_meta(request_id, response, exception):
+            if exception is not None:
+                self.logger.warning(f"Metadata fetch failed for {request_id}: {exception}")
+                return
+            self._meta_cache[request_id] = response
+
+        for start in range(0, len(messages), BATCH_SIZE):
+            batch = self.service.new_batch_http_request(callback=on_meta)
+            for m in messages[start:start + BATCH_SIZE]:
+                batch.add(
+                    self.service.users().messages().get(
+                        userId="me",
+                        id=m["id"],
+                        format="metadata",
+                        metadataHeaders=METADATA_HEADERS,
+                        fields=METADATA_FIELDS,
+                    ),
+                    request_id=m["id"],
+                )
+            self._execute(batch)
+
+    def _adaptive_interval(self, found: int) -> float:
+        """Adapt the poll interval to this mailbox's arrival rate.
+
+        Inter-arrival times are modelled as exponential. Its rate estimate is
+        arrivals / observed time, counting the still-open gap since the last
+        arrival, so a quiet spell stretches the interval and a burst shrinks
+        it. Falls back to check_interval until two arrivals have been seen.
+        """
+        now = time.monotonic()
+        if found:
+            self._arrivals.append(now)
+        if len(self._arrivals) < 2:
+            return self.check_interval
+        mean_gap = (now - self._arrivals[0]) / (len(self._arrivals) - 1)
+        interval = mean_gap / POLLS_PER_ARRIVAL
+        return max(MIN_POLL_INTERVAL, min(MAX_POLL_INTERVAL, interval))
+
     def _send_auto_reply(self, message_id: str, thread_id: str, headers: dict) -> bool:
         """Send an auto-reply to a Gmail message using the Gmail API.
 
         Constructs a proper RFC 2822 reply with In-Reply-To / References headers
         so the reply appears in the same thread.
         """
-        import base64
-        from email.mime.text import MIMEText
-
         try:
             to_addr = headers.get("From", "")
             if not to_addr:
@@ -177,17 +671,18 @@ class GmailWatcher(BaseWatcher):
             reply_subject = subject if subject.lower().startswith("re:") else f"Re: {subject}"
             msg_id_header = headers.get("Message-ID", message_id)
 
-            reply = MIMEText(GMAIL_AUTO_REPLY)
-            reply["To"] = to_addr
-            reply["Subject"] = reply_subject
-            reply["In-Reply-To"] = msg_id_header
-            reply["References"] = msg_id_header
+            msg_id_bytes = _header_bytes(msg_id_header)
+            reply = _REPLY_TEMPLATE % (
+                # formataddr RFC 2047-encodes a non-ASCII display name only
+                _header_bytes(formataddr(parseaddr(to_addr))),
+                _header_bytes(reply_subject), msg_id_bytes, msg_id_bytes,
+            )
 
-            raw = base64.urlsafe_b64encode(reply.as_bytes()).decode()
-            self.service.users().messages().send(
+            raw = base64.urlsafe_b64encode(reply).decode()
+            self._execute(self.service.users().messages().send(
                 userId="me",
                 body={"raw": raw, "threadId": thread_id},
-            ).execute()
+            ), http=self._http())
             self.logger.info(f"Auto-replied to email from: {to_addr}")
             return True
         except Exception as e:
@@ -201,29 +696,33 @@ class GmailWatcher(BaseWatcher):
         for Claude to process.  All other emails receive an auto-reply and
         are logged to Done/ without entering the review queue.
         """
-        msg = self.service.users().messages().get(
-            userId="me",
-            id=message["id"],
-            format="metadata",
-            metadataHeaders=["From", "Subject", "Date", "To", "Message-ID"],
-        ).execute()
+        msg = self._meta_cache.pop(message["id"], None)
+        if msg is None:
+            msg = self._execute(self.service.users().messages().get(
+                userId="me",
+                id=message["id"],
+                format="metadata",
+                metadataHeaders=METADATA_HEADERS,
+                fields=METADATA_FIELDS,
+            ), http=self._http())
 
         headers = {h["name"]: h["value"] for h in msg["payload"]["headers"]}
         snippet = msg.get("snippet", "")
         labels = msg.get("labelIds", [])
         thread_id = msg.get("threadId", message["id"])
+        sender = headers.get("From", "Unknown")
+        subject = headers.get("Subject", "No Subject")
 
         # Determine priority from labels
         priority = "P1" if "IMPORTANT" in labels else "P2"
         if "CATEGORY_PERSONAL" in labels:
             priority = "P1"
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = self._cycle_ts
         filename = f"EMAIL_{timestamp}_{message['id'][:8]}.md"
 
         # ── Auto-reply path: no business keywords in snippet ───────────────
-        snippet_lower = snippet.lower()
-        has_keywords = any(kw in snippet_lower for kw in BUSINESS_KEYWORDS)
+        has_keywords = _KEYWORD_MATCHER.search(snippet.lower())
 
         if not has_keywords:
             done_dir = self.vault_path / "Done"
@@ -232,27 +731,29 @@ class GmailWatcher(BaseWatcher):
 
             if DRY_RUN:
                 self.logger.info(
-                    f"[DRY RUN] Would auto-reply to email from: {headers.get('From', 'Unknown')}"
+                    f"[DRY RUN] Would auto-reply to email from: {sender}"
                 )
             else:
                 success = self._send_auto_reply(message["id"], thread_id, headers)
+                if success:
+                    with self._lock:
+                        self._pending_read.append(message["id"])
                 done_file.write_text(
                     f"---\ntype: email_auto_replied\n"
-                    f"from: {headers.get('From', 'Unknown')}\n"
-                    f"subject: {headers.get('Subject', 'No Subject')}\n"
-                    f"created: {datetime.now().isoformat()}\nauto_reply_sent: {success}\n---\n\n"
+                    f"from: {sender}\n"
+                    f"subject: {subject}\n"
+                    f"created: {self._cycle_iso}\nauto_reply_sent: {success}\n---\n\n"
                     f"Auto-replied to email (no business keywords detected in snippet).\n\n"
                     f"**Reply sent:** {GMAIL_AUTO_REPLY}\n"
                 )
                 self.log_event("email_auto_reply_sent", {
                     "message_id": message["id"],
-                    "from": headers.get("From", "Unknown"),
-                    "subject": headers.get("Subject", "No Subject"),
+                    "from": sender,
+                    "subject": subject,
                     "success": success,
                 })
 
-            self.processed_ids.add(message["id"])
-            self._save_processed_ids()
+            self._save_processed_ids(message["id"])
             return done_file
         # ───────────────────────────────────────────────────────────────────
 
@@ -260,27 +761,29 @@ class GmailWatcher(BaseWatcher):
 
         if DRY_RUN:
             self.logger.info(f"[DRY RUN] Would create: {action_file.name}")
-            self.processed_ids.add(message["id"])
+            with self._lock:
+                self.processed_ids.add(message["id"])
             return action_file
 
+        date = headers.get("Date", "Unknown")
         content = f"""---
 type: email
 source: gmail
 message_id: {message['id']}
-from: {headers.get('From', 'Unknown')}
+from: {sender}
 to: {headers.get('To', 'Unknown')}
-subject: {headers.get('Subject', 'No Subject')}
-date: {headers.get('Date', 'Unknown')}
-received: {datetime.now().isoformat()}
+subject: {subject}
+date: {date}
+received: {self._cycle_iso}
 priority: {priority}
 status: pending
 assigned_to: claude_code
 ---
 
-## Email: {headers.get('Subject', 'No Subject')}
+## Email: {subject}
 
-**From:** {headers.get('From', 'Unknown')}
-**Date:** {headers.get('Date', 'Unknown')}
+**From:** {sender}
+**Date:** {date}
 
 ### Preview
 
@@ -301,13 +804,12 @@ _Add context or action taken here._
 *Created by: GmailWatcher · Bronze Tier*
 """
         action_file.write_text(content)
-        self.processed_ids.add(message["id"])
-        self._save_processed_ids()
+        self._save_processed_ids(message["id"])
 
         self.log_event("email_detected", {
             "message_id": message["id"],
-            "from": headers.get("From", "Unknown"),
-            "subject": headers.get("Subject", "No Subject"),
+            "from": sender,
+            "subject": subject,
             "priority": priority,
         })
 
@@ -317,7 +819,7 @@ _Add context or action taken here._
 def main():
     parser = argparse.ArgumentParser(
         description="AI Employee — Gmail Watcher",
-        epilog="Run with --setup to authorize Gmail access.",
+        epilog="The first run without token.json opens the OAuth flow to authorize Gmail access.",
     )
     parser.add_argument("--vault", default=str(Path(__file__).parent.parent / "AI_Employee_Vault"))
     parser.add_argument("--credentials", default=str(Path(__file__).parent / "credentials.json"))
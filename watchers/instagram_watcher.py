@@ -18,21 +18,66 @@ Environment variables:
 """
 
 import argparse
+import asyncio
+import importlib.util
+import inspect
 import json
 import logging
 import os
 import sys
+import types
+from collections import OrderedDict, deque
 from datetime import datetime
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
-from base_watcher import BaseWatcher
+from base_watcher import BaseWatcher, content_id, write_file
+from bloom_filter import BloomFilter
+from keyword_matcher import WordMatcher
+
+
+def _skip_playwright_stack_capture():
+    """
+    Stop Playwright walking the Python stack on every API call.
+
+    playwright-python calls inspect.stack() per call (and per sync-API
+    dispatch) only to attach caller locations to traces and error metadata;
+    for a headless scraper that walk is a large share of its CPU time.
+    Playwright's own modules get an ``inspect`` whose stack() returns no
+    frames — the process-wide inspect module is left untouched.
+    """
+    try:
+        import playwright._impl._connection as connection
+        import playwright._impl._sync_base as sync_base
+    except ImportError:
+        return  # internals moved; keep Playwright's default behaviour
+    no_stack = types.SimpleNamespace(**vars(inspect))
+    no_stack.stack = lambda context=1: []
+    for module in (connection, sync_base):
+        if getattr(module, "inspect", None) is inspect:
+            module.inspect = no_stack
+
+
+_PLAYWRIGHT = None
+
+
+def _load_playwright():
+    """Import Playwright on first use so dry-run / MCP-only callers never pay for it.
+
+    Returns (sync_playwright, async_playwright, PlaywrightTimeout), or None
+    if not installed. Both APIs raise the same TimeoutError class.
+    """
+    global _PLAYWRIGHT
+    if _PLAYWRIGHT is None:
+        try:
+            from playwright.async_api import async_playwright
+            from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
+            _skip_playwright_stack_capture()
+            _PLAYWRIGHT = (sync_playwright, async_playwright, PlaywrightTimeout)
+        except ImportError:
+            _PLAYWRIGHT = False
+    return _PLAYWRIGHT or None
 
-try:
-    from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
-    PLAYWRIGHT_AVAILABLE = True
-except ImportError:
-    PLAYWRIGHT_AVAILABLE = False
 
 logger = logging.getLogger("InstagramWatcher")
 
@@ -61,9 +106,112 @@ BUSINESS_KEYWORDS = [
     "feature", "reel", "story", "post", "content", "creator",
 ]
 
+# Matched as whole words (or their plurals): short keywords like "ad" and
+# "dm" would otherwise fire inside "read", "had", "admin".
+_KEYWORD_MATCHER = WordMatcher(BUSINESS_KEYWORDS)
+
 INSTAGRAM_URL = "https://www.instagram.com"
 INSTAGRAM_INBOX_URL = "https://www.instagram.com/direct/inbox/"
 
+# Processed IDs kept in .instagram_state.log; the log is compacted back to
+# this many lines once as many more have been appended.
+MAX_PROCESSED = 500
+
+# Keyword results remembered per item ID (LRU), for items seen again unprocessed
+KEYWORD_CACHE_SIZE = 1000
+
+# Headless Chromium flags: keep background tabs at full speed and switch off
+# subsystems (extensions, sync, first-run UI, translate) the watcher never uses.
+CHROMIUM_ARGS = [
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-background-timer-throttling",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-renderer-backgrounding",
+    "--disable-extensions",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--disable-blink-features=AutomationControlled",
+    "--disable-infobars",
+    "--disable-features=TranslateUI",
+]
+
+# Resource types the watcher never reads; aborted before they are fetched.
+# Stylesheets still load: clicks and visibility waits depend on the layout.
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+
+
+async def _block_unused(route):
+    """Context route handler: drop images/video/fonts, pass everything else."""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+# page.evaluate snippet: walks a selector list in priority order inside the
+# browser and returns the first selector that matches plus the text of its
+# first n elements — one round-trip however many selectors miss. Text comes
+# from the DOM's text nodes (one per line) instead of innerText, which forces
+# a style/layout pass; unlike raw textContent, adjacent nodes ("Sender", "Hi")
+# stay separate lines so the first line is still the sender.
+_FIRST_MATCH_TEXTS_JS = """({sels, n}) => {
+    const textOf = e => {
+        const parts = [];
+        const walker = document.createTreeWalker(e, NodeFilter.SHOW_TEXT);
+        while (walker.nextNode()) {
+            const t = walker.currentNode.nodeValue.trim();
+            if (t) parts.push(t);
+        }
+        return parts.join('\\n');
+    };
+    for (const sel of sels) {
+        const els = document.querySelectorAll(sel);
+        if (els.length) return {sel, texts: [...els].slice(0, n).map(textOf)};
+    }
+    return {sel: null, texts: []};
+}"""
+
+
+# Action file bodies, filled in per item with str.format_map
+_ACTION_TEMPLATE = """---
+type: instagram_{type}
+platform: instagram
+id: {id}
+received: {received}
+priority: {priority}
+status: pending
+sender: {sender}
+keywords_detected: {keywords}
+---
+
+## Instagram {title} Received
+
+**Content:**
+{text}
+
+## Suggested Actions
+- [ ] Review the {type}
+- [ ] Draft response (create in /Pending_Approval/ for HITL if needed)
+- [ ] Consider collaboration opportunity if relevant
+- [ ] Archive after processing
+
+## Keywords Detected
+{keywords_section}
+"""
+
+_TRIAGED_TEMPLATE = (
+    "---\ntype: instagram_dm_triaged\nsender: {sender}\n"
+    "created: {created}\nauto_reply_sent: false\n"
+    "reason: Meta blocks automated DM sending on Instagram web\n---\n\n"
+    "Instagram DM from **{sender}** contained no business keywords.\n\n"
+    "Auto-reply is **not available** for Instagram (Meta blocks web DM automation).\n"
+    "If a reply is needed, open Instagram manually and respond.\n\n"
+    "**Message preview:** {preview}\n"
+)
+
 
 class InstagramWatcher(BaseWatcher):
     """Playwright-based Instagram watcher."""
@@ -72,55 +220,185 @@ class InstagramWatcher(BaseWatcher):
         super().__init__(vault_path, check_interval=180)  # every 3 min
         self.session_path = Path(session_path)
         self.dry_run = os.getenv("DRY_RUN", "false").lower() == "true"
-        self._processed_ids: set = self._load_processed()
-
-    def _load_processed(self) -> set:
-        state_file = self.vault_path / ".instagram_state.json"
-        if state_file.exists():
+        # Most recent IDs, in order, for compacting the state log
+        self._recent: deque = deque(maxlen=MAX_PROCESSED)
+        self._processed_ids: BloomFilter = self._load_processed()
+        self._appended = 0  # lines appended since the last compaction
+        self._state_fp = open(self._state_log, "a", buffering=1)
+        self._kw_cache: OrderedDict = OrderedDict()
+        # Long-lived async browser, reused across polling cycles (see
+        # _ensure_browser). Its objects are bound to this event loop, so the
+        # loop lives as long as the watcher instead of one asyncio.run() per cycle.
+        self._loop = None
+        self._pw = None
+        self._browser = None
+        self._page = None
+        self._dm_page = None
+
+    @property
+    def _state_log(self) -> Path:
+        return self.vault_path / ".instagram_state.log"
+
+    def _load_processed(self) -> BloomFilter:
+        """Load processed IDs from the append-only .instagram_state.log.
+
+        Only the last MAX_PROCESSED entries are kept; the log is compacted to
+        that tail on startup. IDs from the old .instagram_state.json are
+        carried over once.
+        """
+        legacy_file = self.vault_path / ".instagram_state.json"
+        legacy = []
+        if legacy_file.exists():
             try:
-                data = json.loads(state_file.read_text())
-                return set(data.get("processed_ids", []))
+                legacy = json.loads(legacy_file.read_text()).get("processed_ids", [])
             except Exception:
                 pass
-        return set()
-
-    def _save_processed(self):
-        state_file = self.vault_path / ".instagram_state.json"
-        state_file.write_text(json.dumps(
-            {"processed_ids": list(self._processed_ids)[-500:]},
-            indent=2,
-        ))
+        self._recent.extend(legacy)
+        lines = 0
+        if self._state_log.exists():
+            with open(self._state_log) as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        lines += 1
+                        self._recent.append(line)
+        if legacy or lines > len(self._recent):
+            self._compact()
+        if legacy:
+            legacy_file.unlink()
+        return self._recent_bloom()
+
+    def _recent_bloom(self) -> BloomFilter:
+        """Bloom filter over the recent IDs (~2 KB, sized for a full log).
+
+        Between compactions the log holds up to 2 * MAX_PROCESSED IDs; the
+        filter is rebuilt from the recent tail at each compaction, so it
+        never fills past its capacity.
+        """
+        bloom = BloomFilter(capacity=2 * MAX_PROCESSED, error_rate=0.001)
+        bloom.update(self._recent)
+        return bloom
+
+    def _compact(self):
+        """Rewrite the state log as just the most recent IDs."""
+        self._state_log.write_text("".join(i + "\n" for i in self._recent))
+
+    def _save_processed(self, item_id: str):
+        """Mark an item processed: one line appended, no full rewrite."""
+        self._processed_ids.add(item_id)
+        self._recent.append(item_id)
+        self._state_fp.write(item_id + "\n")
+        self._appended += 1
+        if self._appended >= MAX_PROCESSED:
+            self._state_fp.close()
+            self._compact()
+            self._processed_ids = self._recent_bloom()
+            self._state_fp = open(self._state_log, "a", buffering=1)
+            self._appended = 0
+
+    def _match_keywords(self, item_id: str, snippet: str) -> list:
+        """Business keywords in a snippet, memoized on its content-derived ID."""
+        keywords = self._kw_cache.get(item_id)
+        if keywords is not None:
+            self._kw_cache.move_to_end(item_id)
+            return keywords
+        keywords = _KEYWORD_MATCHER.find(snippet.lower())
+        self._kw_cache[item_id] = keywords
+        if len(self._kw_cache) > KEYWORD_CACHE_SIZE:
+            self._kw_cache.popitem(last=False)
+        return keywords
 
     def check_for_updates(self) -> list:
         if self.dry_run:
             logger.info("[DRY RUN] Skipping Instagram check.")
             return []
-        if not PLAYWRIGHT_AVAILABLE:
+        pw = _load_playwright()
+        if pw is None:
             logger.warning("Playwright not installed.")
             return []
+        _, async_playwright, PlaywrightTimeout = pw
         if not self.session_path.exists():
             logger.warning("Instagram session not found. Run --setup first.")
             return []
 
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(
+            self._check_async(async_playwright, PlaywrightTimeout)
+        )
+
+    async def _check_async(self, async_playwright, PlaywrightTimeout) -> list:
+        """Fetch notifications and DMs concurrently on two tabs of one context."""
         items = []
         try:
-            with sync_playwright() as p:
-                browser = p.chromium.launch_persistent_context(
-                    str(self.session_path),
-                    headless=True,
-                    args=["--no-sandbox", "--disable-dev-shm-usage"],
-                )
-                page = browser.pages[0] if browser.pages else browser.new_page()
-                items.extend(self._get_notifications(page))
-                items.extend(self._get_dms(page))
-                browser.close()
+            notif_page, dm_page = await self._ensure_browser(async_playwright)
+            # Both fetches are dominated by navigation and selector waits, so
+            # running them side by side roughly halves the cycle time.
+            notifications, dms = await asyncio.gather(
+                self._get_notifications(notif_page),
+                self._get_dms(dm_page),
+            )
+            items.extend(notifications)
+            items.extend(dms)
         except PlaywrightTimeout:
             logger.warning("Playwright timeout during Instagram check.")
         except Exception as e:
             logger.error(f"Instagram check failed: {e}")
+            # Browser may have crashed — relaunch it on the next cycle
+            await self._close_browser()
 
         return items
 
+    async def _ensure_browser(self, async_playwright):
+        """Launch the persistent context once and return its two pages.
+
+        Chromium start-up and profile load are paid on the first cycle only;
+        later cycles just navigate the already-open notification and DM tabs.
+        The persistent context is itself the BrowserContext, so no
+        new_context() is needed.
+        """
+        if self._browser is None:
+            self._pw = await async_playwright().start()
+            self._browser = await self._pw.chromium.launch_persistent_context(
+                str(self.session_path),
+                headless=True,
+                args=CHROMIUM_ARGS,
+                ignore_default_args=["--enable-automation"],
+            )
+            await self._browser.route("**/*", _block_unused)
+            pages = self._browser.pages
+            self._page = pages[0] if pages else await self._browser.new_page()
+            self._dm_page = await self._browser.new_page()
+        return self._page, self._dm_page
+
+    async def _close_browser(self):
+        """Close the long-lived browser and Playwright driver, ignoring errors."""
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception:
+                pass
+        if self._pw is not None:
+            try:
+                await self._pw.stop()
+            except Exception:
+                pass
+        self._pw = None
+        self._browser = None
+        self._page = None
+        self._dm_page = None
+
+    def run(self):
+        """Run the polling loop, closing the shared browser on exit."""
+        try:
+            super().run()
+        finally:
+            if self._loop is not None:
+                self._loop.run_until_complete(self._close_browser())
+                self._loop.close()
+                self._loop = None
+            self._state_fp.close()
+
     # Selectors tried in order to open the notifications panel
     NOTIF_BUTTON_SELECTORS = [
         '[aria-label="Notifications"]',
@@ -146,18 +424,35 @@ class InstagramWatcher(BaseWatcher):
         'a[href*="/direct/t/"]',
     ]
 
-    def _get_notifications(self, page) -> list:
+    @staticmethod
+    async def _wait_for_any(page, selectors, timeout: int, state: str = "attached") -> bool:
+        """Wait until any of the selectors matches; False on timeout.
+
+        Replaces fixed sleeps: returns as soon as the content has rendered.
+        """
+        _, _, PlaywrightTimeout = _load_playwright()
+        try:
+            await page.wait_for_selector(", ".join(selectors), state=state, timeout=timeout)
+            return True
+        except PlaywrightTimeout:
+            return False
+
+    async def _get_notifications(self, page) -> list:
         items = []
         try:
-            page.goto(INSTAGRAM_URL, wait_until="domcontentloaded", timeout=30000)
-            page.wait_for_timeout(4000)
+            await page.goto(INSTAGRAM_URL, wait_until="domcontentloaded", timeout=30000)
+            ready = await self._wait_for_any(page, self.NOTIF_BUTTON_SELECTORS, timeout=8000)
 
             # Open notifications panel — try each button selector in turn
             opened = False
             for btn_sel in self.NOTIF_BUTTON_SELECTORS:
+                # Once the page is ready, absent buttons are skipped instead
+                # of each waiting out the click timeout
+                if ready and await page.query_selector(btn_sel) is None:
+                    continue
                 try:
-                    page.click(btn_sel, timeout=4000)
-                    page.wait_for_timeout(2000)
+                    await page.click(btn_sel, timeout=4000)
+                    await self._wait_for_any(page, self.NOTIF_ITEM_SELECTORS, timeout=5000, state="visible")
                     opened = True
                     logger.debug(f"Instagram: notifications opened with '{btn_sel}'")
                     break
@@ -166,30 +461,28 @@ class InstagramWatcher(BaseWatcher):
 
             if not opened:
                 try:
-                    body_text = page.inner_text("body")
+                    body_text = await page.inner_text("body")
                     logger.warning(
                         f"Instagram: could not open notifications panel. "
-                        f"Page title: '{page.title()}'. "
+                        f"Page title: '{await page.title()}'. "
                         f"Body snippet: {body_text[:300]!r}"
                     )
                 except Exception:
                     logger.warning("Instagram: could not open notifications panel.")
                 return items
 
-            # Find notification items — try each selector in turn
-            notif_items = []
-            used_selector = None
-            for sel in self.NOTIF_ITEM_SELECTORS:
-                found = page.query_selector_all(sel)
-                if found:
-                    notif_items = found
-                    used_selector = sel
-                    logger.info(f"Instagram notifications: found {len(found)} items with selector '{sel}'")
-                    break
+            # Find notification items — selectors are tried in order in the
+            # browser, returning the texts of the first 15 matches
+            found = await page.evaluate(
+                _FIRST_MATCH_TEXTS_JS, {"sels": self.NOTIF_ITEM_SELECTORS, "n": 15}
+            )
+            texts = found["texts"]
+            if texts:
+                logger.info(f"Instagram notifications: found {len(texts)} items with selector '{found['sel']}'")
 
-            if not notif_items:
+            if not texts:
                 try:
-                    body_text = page.inner_text("body")
+                    body_text = await page.inner_text("body")
                     logger.warning(
                         f"Instagram: no notification items found with any selector. "
                         f"Body snippet: {body_text[:300]!r}"
@@ -198,78 +491,70 @@ class InstagramWatcher(BaseWatcher):
                     logger.warning("Instagram: no notification items found.")
                 return items
 
-            for item in notif_items[:15]:
-                try:
-                    text = item.inner_text().strip()
-                    if not text:
-                        continue
-                    item_id = f"ig_notif_{hash(text) & 0xFFFFFF:06x}"
-                    if item_id in self._processed_ids:
-                        continue
-                    keywords_found = [kw for kw in BUSINESS_KEYWORDS if kw in text.lower()]
-                    items.append({
-                        "type": "notification",
-                        "id": item_id,
-                        "text": text[:500],
-                        "keywords": keywords_found,
-                        "timestamp": datetime.now().isoformat(),
-                    })
-                except Exception:
+            for text in texts:
+                if not text:
                     continue
+                snippet = text[:500]
+                item_id = f"ig_notif_{content_id(snippet)}"
+                if item_id in self._processed_ids:
+                    continue
+                keywords_found = self._match_keywords(item_id, snippet)
+                items.append({
+                    "type": "notification",
+                    "id": item_id,
+                    "text": snippet,
+                    "keywords": keywords_found,
+                    "timestamp": datetime.now().isoformat(),
+                })
         except Exception as e:
             logger.warning(f"Could not fetch Instagram notifications: {e}")
         return items
 
-    def _get_dms(self, page) -> list:
+    async def _get_dms(self, page) -> list:
         items = []
         try:
-            page.goto(INSTAGRAM_INBOX_URL, wait_until="domcontentloaded", timeout=30000)
-            page.wait_for_timeout(5000)  # inbox is JS-heavy — needs extra time
-
-            # Find DM threads — try multiple selectors
-            threads = []
-            used_selector = None
-            for sel in self.DM_THREAD_SELECTORS:
-                found = page.query_selector_all(sel)
-                if found:
-                    threads = found
-                    used_selector = sel
-                    logger.info(f"Instagram DMs: found {len(found)} threads with selector '{sel}'")
-                    break
+            await page.goto(INSTAGRAM_INBOX_URL, wait_until="domcontentloaded", timeout=30000)
+            # Inbox is JS-heavy — wait for thread rows rather than a fixed delay
+            await self._wait_for_any(page, self.DM_THREAD_SELECTORS, timeout=10000)
+
+            # Find DM threads — all selectors probed in one round-trip
+            found = await page.evaluate(
+                _FIRST_MATCH_TEXTS_JS, {"sels": self.DM_THREAD_SELECTORS, "n": 10}
+            )
+            threads = found["texts"]
+            if threads:
+                logger.info(f"Instagram DMs: found {len(threads)} threads with selector '{found['sel']}'")
 
             if not threads:
                 try:
-                    body_text = page.inner_text("body")
+                    body_text = await page.inner_text("body")
                     logger.warning(
                         f"Instagram: no DM threads found with any selector. "
-                        f"Page title: '{page.title()}'. "
+                        f"Page title: '{await page.title()}'. "
                         f"Body snippet: {body_text[:300]!r}"
                     )
                 except Exception:
                     logger.warning("Instagram: no DM threads found.")
                 return items
 
-            for thread in threads[:10]:
-                try:
-                    text = thread.inner_text().strip()
-                    if not text:
-                        continue
-                    thread_id = f"ig_dm_{hash(text) & 0xFFFFFF:06x}"
-                    if thread_id in self._processed_ids:
-                        continue
-                    keywords_found = [kw for kw in BUSINESS_KEYWORDS if kw in text.lower()]
-                    # Extract rough sender name from first line
-                    sender = text.split("\n")[0].strip()[:80] if "\n" in text else text[:80]
-                    items.append({
-                        "type": "dm",
-                        "id": thread_id,
-                        "text": text[:500],
-                        "sender": sender,
-                        "keywords": keywords_found,
-                        "timestamp": datetime.now().isoformat(),
-                    })
-                except Exception:
+            for text in threads:
+                if not text:
                     continue
+                snippet = text[:500]
+                thread_id = f"ig_dm_{content_id(snippet)}"
+                if thread_id in self._processed_ids:
+                    continue
+                # Extract rough sender name from first line
+                sender = text.partition("\n")[0].strip()[:80]
+                keywords_found = self._match_keywords(thread_id, snippet)
+                items.append({
+                    "type": "dm",
+                    "id": thread_id,
+                    "text": snippet,
+                    "sender": sender,
+                    "keywords": keywords_found,
+                    "timestamp": datetime.now().isoformat(),
+                })
         except Exception as e:
             logger.warning(f"Could not fetch Instagram DMs: {e}")
         return items
@@ -282,7 +567,8 @@ class InstagramWatcher(BaseWatcher):
         is blocked by Meta — a manual reply notice is written instead.
         DMs/notifications with keywords go to Needs_Action/ for review.
         """
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        now = datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
         filename = f"INSTAGRAM_{item['type'].upper()}_{timestamp}_{item['id'][:8]}.md"
         keywords = item.get("keywords", [])
         priority = "high" if keywords else "normal"
@@ -293,17 +579,12 @@ class InstagramWatcher(BaseWatcher):
             done_dir = self.vault_path / "Done"
             done_dir.mkdir(exist_ok=True)
             done_file = done_dir / filename
-            done_file.write_text(
-                f"---\ntype: instagram_dm_triaged\nsender: {sender}\n"
-                f"created: {datetime.now().isoformat()}\nauto_reply_sent: false\n"
-                f"reason: Meta blocks automated DM sending on Instagram web\n---\n\n"
-                f"Instagram DM from **{sender}** contained no business keywords.\n\n"
-                f"Auto-reply is **not available** for Instagram (Meta blocks web DM automation).\n"
-                f"If a reply is needed, open Instagram manually and respond.\n\n"
-                f"**Message preview:** {item.get('text', '')[:200]}\n"
-            )
-            self._processed_ids.add(item["id"])
-            self._save_processed()
+            write_file(done_file, _TRIAGED_TEMPLATE.format_map({
+                "sender": sender,
+                "created": now.isoformat(),
+                "preview": item.get("text", "")[:200],
+            }))
+            self._save_processed(item["id"])
             self.log_event("instagram_dm_triaged", {
                 "sender": sender, "auto_reply": False,
                 "reason": "no_keywords_meta_blocks_web_dm", "file": filename,
@@ -311,35 +592,20 @@ class InstagramWatcher(BaseWatcher):
             return done_file
         # ───────────────────────────────────────────────────────────────────
 
-        content = f"""---
-type: instagram_{item['type']}
-platform: instagram
-id: {item['id']}
-received: {item.get("timestamp", datetime.now().isoformat())}
-priority: {priority}
-status: pending
-sender: {sender}
-keywords_detected: {", ".join(keywords) if keywords else "none"}
----
-
-## Instagram {item['type'].title()} Received
-
-**Content:**
-{item.get("text", "(no text)")}
-
-## Suggested Actions
-- [ ] Review the {item['type']}
-- [ ] Draft response (create in /Pending_Approval/ for HITL if needed)
-- [ ] Consider collaboration opportunity if relevant
-- [ ] Archive after processing
-
-## Keywords Detected
-{", ".join(keywords) if keywords else "No business keywords detected."}
-"""
+        joined = ", ".join(keywords)
         filepath = self.needs_action / filename
-        filepath.write_text(content)
-        self._processed_ids.add(item["id"])
-        self._save_processed()
+        write_file(filepath, _ACTION_TEMPLATE.format_map({
+            "type": item["type"],
+            "title": item["type"].title(),
+            "id": item["id"],
+            "received": item.get("timestamp", now.isoformat()),
+            "priority": priority,
+            "sender": sender,
+            "keywords": joined or "none",
+            "text": item.get("text", "(no text)"),
+            "keywords_section": joined or "No business keywords detected.",
+        }))
+        self._save_processed(item["id"])
 
         self.log_event("instagram_item_detected", {
             "item_type": item["type"],
@@ -356,7 +622,8 @@ keywords_detected: {", ".join(keywords) if keywords else "none"}
             logger.info(f"[DRY RUN] Would post to Instagram: {caption[:80]}...")
             return {"success": True, "dry_run": True, "caption": caption}
 
-        if not PLAYWRIGHT_AVAILABLE:
+        # Only report availability; nothing here drives a browser
+        if importlib.util.find_spec("playwright") is None:
             return {"success": False, "error": "Playwright not available"}
 
         # Instagram posting via web is limited; note this for users
@@ -384,9 +651,11 @@ keywords_detected: {", ".join(keywords) if keywords else "none"}
 
 
 def setup_session(vault_path: str, session_path: str):
-    if not PLAYWRIGHT_AVAILABLE:
+    pw = _load_playwright()
+    if pw is None:
         print("ERROR: Playwright not installed.")
         sys.exit(1)
+    sync_playwright, _, _ = pw
 
     session = Path(session_path)
     session.mkdir(parents=True, exist_ok=True)
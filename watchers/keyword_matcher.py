@@ -0,0 +1,166 @@
+"""keyword_matcher.py - Single-pass business-keyword matching for AI Employee watchers.
+
+Gold Tier: keyword triage shared by the social and email watchers.
+"""
+
+import re
+import sys
+
+try:
+    import hyperscan  # optional SIMD multi-pattern engine (x86-64)
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+try:
+    import ahocorasick  # pyahocorasick — optional C automaton
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+
+class KeywordMatcher:
+    """
+    Compiled matcher for a fixed keyword list.
+
+    Returns every keyword that occurs as a substring of the text — the same
+    result as ``[kw for kw in keywords if kw in text.lower()]``.
+
+    Prefers a Hyperscan database (all keywords in one vectorized automaton),
+    then a pyahocorasick automaton, whichever is installed. Otherwise each
+    keyword gets one C-level ``in`` test; measured against a trie-factored
+    regex on 100-8192 character texts, that was faster at every length.
+
+    Usage:
+        matcher = KeywordMatcher(BUSINESS_KEYWORDS)
+        found = matcher.find(text.lower())
+    """
+
+    def __init__(self, keywords):
+        self.keywords = tuple(dict.fromkeys(kw.lower() for kw in keywords))
+        self._hs_db = None
+        self._automaton = None
+
+        if HYPERSCAN_AVAILABLE:
+            # SINGLEMATCH: each keyword id is reported at most once per scan
+            flags = hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH
+            self._hs_db = hyperscan.Database()
+            self._hs_db.compile(
+                expressions=[re.escape(kw).encode() for kw in self.keywords],
+                ids=list(range(len(self.keywords))),
+                elements=len(self.keywords),
+                flags=[flags] * len(self.keywords),
+            )
+            return
+
+        if AHOCORASICK_AVAILABLE:
+            self._automaton = ahocorasick.Automaton()
+            for i, kw in enumerate(self.keywords):
+                self._automaton.add_word(kw, i)
+            self._automaton.make_automaton()
+
+    def find(self, lower: str) -> list:
+        """Return matched keywords (in keyword-list order) for lowercased text."""
+        hits = set()
+        if self._hs_db is not None:
+            self._hs_db.scan(
+                lower.encode(),
+                match_event_handler=lambda i, start, end, flags, ctx: hits.add(i),
+            )
+        elif self._automaton is not None:
+            for _, i in self._automaton.iter(lower):
+                hits.add(i)
+        else:
+            return [kw for kw in self.keywords if kw in lower]
+        return [self.keywords[i] for i in sorted(hits)]
+
+    def search(self, lower: str) -> bool:
+        """Return True as soon as any keyword occurs in lowercased text."""
+        if self._hs_db is not None:
+            # A truthy return from the handler stops the scan at the first hit
+            try:
+                self._hs_db.scan(
+                    lower.encode(),
+                    match_event_handler=lambda i, start, end, flags, ctx: True,
+                )
+            except hyperscan.ScanTerminated:
+                return True
+            return False
+        if self._automaton is not None:
+            return next(self._automaton.iter(lower), None) is not None
+        return any(kw in lower for kw in self.keywords)
+
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def _plural(word: str) -> str:
+    """Regular English plural of a keyword: "fee" -> "fees", "inquiry" -> "inquiries"."""
+    if word.endswith(("s", "x", "z", "ch", "sh")):
+        return word + "es"
+    if len(word) > 1 and word.endswith("y") and word[-2] not in "aeiou":
+        return word[:-1] + "ies"
+    return word + "s"
+
+
+class WordMatcher:
+    """
+    Keyword matcher for whole words.
+
+    The text is tokenized once and each distinct word is looked up in a
+    dict of the (interned) single-word keywords and their plural forms, so
+    "fee" matches "fees" but not "coffee" or "feedback", and "ad" matches
+    "ads" but not "read" or "admin". Multi-word phrases ("reach out") are
+    matched by one word-bounded regex. Same find()/search() interface as
+    KeywordMatcher.
+
+    Usage:
+        matcher = WordMatcher(BUSINESS_KEYWORDS)
+        found = matcher.find(text.lower())
+    """
+
+    def __init__(self, keywords):
+        self.keywords = tuple(dict.fromkeys(sys.intern(kw.lower()) for kw in keywords))
+        words = [kw for kw in self.keywords if " " not in kw]
+        # word form -> keyword; a keyword's own entry wins over another's plural
+        self._forms = {_plural(kw): kw for kw in words}
+        self._forms.update((kw, kw) for kw in words)
+        phrases = [kw for kw in self.keywords if " " in kw]
+        self._phrase_re = (
+            re.compile(r"\b(?:" + "|".join(map(re.escape, phrases)) + r")\b") if phrases else None
+        )
+
+    def _word_hits(self, lower: str):
+        """Yield single-word keywords that occur as whole words of the text."""
+        forms = self._forms
+        for word in set(_WORD_RE.findall(lower)):
+            kw = forms.get(word)
+            if kw is not None:
+                yield kw
+
+    def find(self, lower: str) -> list:
+        """Return matched keywords (in keyword-list order) for lowercased text."""
+        hits = set(self._word_hits(lower))
+        if self._phrase_re is not None:
+            hits.update(self._phrase_re.findall(lower))
+        return [kw for kw in self.keywords if kw in hits]
+
+    def search(self, lower: str) -> bool:
+        """Return True as soon as any keyword occurs in lowercased text."""
+        if next(self._word_hits(lower), None) is not None:
+            return True
+        return self._phrase_re is not None and self._phrase_re.search(lower) is not None
+
+
+def scan_message(text: str, matcher: KeywordMatcher, limit: int = 500) -> tuple:
+    """
+    Split a scraped message into (snippet, first_line, keywords) in one pass.
+
+    The snippet is capped at ``limit`` characters and only the snippet is
+    scanned for keywords, so every flagged keyword is visible in the stored
+    text. ``first_line`` is the rough sender name (first line, max 80 chars).
+    """
+    snippet = text[:limit]
+    newline = text.find("\n")
+    first_line = (text[:newline].strip() if newline != -1 else text)[:80]
+    return snippet, first_line, matcher.find(snippet.lower())
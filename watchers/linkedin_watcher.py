@@ -22,24 +22,32 @@ Usage:
     python watchers/linkedin_watcher.py --vault AI_Employee_Vault --dry-run
 
 Environment Variables:
-    LINKEDIN_SESSION_PATH   Path to persistent Chromium session (default: .linkedin_session)
+    LINKEDIN_SESSION_PATH   Path to the browser session directory (default: .linkedin_session)
     LINKEDIN_EMAIL          LinkedIn login email
     LINKEDIN_PASSWORD       LinkedIn login password
+    LINKEDIN_LEGACY_SESSION=true  Use the full Chromium profile dir instead of state.json
     DRY_RUN=true            Log only, no real actions
 """
 
 import os
+import re
 import sys
 import json
+import asyncio
 import argparse
 import logging
-import time
 from pathlib import Path
 from datetime import datetime
+from functools import lru_cache
+from html import unescape
+from urllib.parse import urlsplit
 
 # Add parent dir to path
 sys.path.insert(0, str(Path(__file__).parent))
-from base_watcher import BaseWatcher
+from base_watcher import BaseWatcher, content_id, write_atomic, write_file
+from bloom_filter import RotatingBloomFilter
+from browser_session import new_context, new_context_async, save_storage_state, save_storage_state_async
+from retry_handler import CircuitBreaker
 
 # Load .env from project root
 try:
@@ -57,6 +65,19 @@ logging.basicConfig(
 
 DRY_RUN = os.getenv("DRY_RUN", "false").lower() == "true"
 
+# The session is kept as cookies + localStorage in <session path>/state.json
+# (Playwright storage_state) and loaded into a fresh context; a session dir
+# that only has the old Chromium profile is exported to state.json on first
+# use (see browser_session). Set to keep using the profile directory itself.
+LEGACY_SESSION = os.getenv("LINKEDIN_LEGACY_SESSION", "false").lower() == "true"
+
+CHROMIUM_ARGS = ["--no-sandbox", "--disable-dev-shm-usage"]
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
 # Default auto-reply text for messages with no business keywords.
 # Override via LINKEDIN_AUTO_REPLY in .env
 LINKEDIN_AUTO_REPLY = os.getenv(
@@ -72,12 +93,266 @@ PRIORITY_KEYWORDS = [
     "partnership", "job", "hire", "project", "quote",
 ]
 
+# Priority tiers: the first five keywords mark P1, the rest P2. Anchored at a
+# word start only, so plurals ("jobs", "payments") still match as they did with
+# substring tests, but a keyword buried mid-word no longer does.
+_P1_RE = re.compile(r"\b(?:" + "|".join(map(re.escape, PRIORITY_KEYWORDS[:5])) + ")", re.IGNORECASE)
+_P2_RE = re.compile(r"\b(?:" + "|".join(map(re.escape, PRIORITY_KEYWORDS[5:])) + ")", re.IGNORECASE)
+
+# Default Playwright timeouts (ms) for the shared context: selector waits and
+# locator actions, and page navigations. Calls that pass timeout= override them.
+SELECTOR_TIMEOUT = 3000
+NAVIGATION_TIMEOUT = 8000
+
+# Processed notification/message IDs live in a two-generation Bloom filter
+# (~48 KB on disk) that rotates every PROCESSED_CAPACITY IDs, so the last 10k
+# are always remembered and a new item is mistaken for a seen one ~1 in 5k times.
+PROCESSED_CAPACITY = 10_000
+PROCESSED_ERROR_RATE = 1e-4
+
+# After this many failed checks/posts in a row (login walls, CAPTCHA
+# challenges, crashes) LinkedIn is left alone for BREAKER_RECOVERY seconds
+# instead of launching Chromium into the same block every poll.
+BREAKER_FAILURES = 3
+BREAKER_RECOVERY = 900
+
+# Action file bodies, filled in per item with str.format_map
+_MESSAGE_TEMPLATE = """---
+type: linkedin_message
+source: linkedin
+sender: {sender}
+preview: "{preview_short}"
+received: {received}
+priority: {priority}
+status: pending
+assigned_to: claude_code
+---
+
+## LinkedIn Message from {sender}
+
+**Priority:** {priority}
+
+### Message Preview
+
+> {preview}
+
+### Suggested Actions
+
+- [ ] Read full message on LinkedIn
+- [ ] Draft reply → create approval file in /Pending_Approval/
+- [ ] If sales opportunity → create Plan in /Plans/
+- [ ] Archive after processing
+
+### Notes
+
+_Add context or action taken here._
+
+---
+*Created by: LinkedInWatcher · Silver Tier*
+"""
+
+_NOTIFICATION_TEMPLATE = """---
+type: linkedin_notification
+source: linkedin
+received: {received}
+priority: {priority}
+status: pending
+assigned_to: claude_code
+---
+
+## LinkedIn Notification
+
+**Priority:** {priority}
+{link}
+### Notification Text
+
+> {text}
+
+### Suggested Actions
+
+- [ ] Review notification on LinkedIn
+- [ ] Take appropriate action (reply, like, connect)
+- [ ] If action needed → create approval file in /Pending_Approval/
+- [ ] Archive after processing
+
+---
+*Created by: LinkedInWatcher · Silver Tier*
+"""
+
+_AUTO_REPLIED_TEMPLATE = (
+    "---\ntype: linkedin_auto_replied\nsender: {sender}\n"
+    "created: {created}\nauto_reply_sent: {success}\n---\n\n"
+    "Auto-replied to LinkedIn message (no business keywords detected).\n\n"
+    "**Reply sent:** {reply}\n"
+)
+
+# Requests the scraper never reads: avatars, video, webfonts, and the ad and
+# analytics beacons. Stylesheets stay — posting clicks through the composer,
+# which needs real layout.
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+BLOCKED_HOSTS = frozenset({
+    "px.ads.linkedin.com",
+    "snap.licdn.com",
+    "www.google-analytics.com",
+    "www.googletagmanager.com",
+    "static.doubleclick.net",
+})
+
+
+async def _block_unused(route):
+    """Context route handler: drop media, fonts and trackers, pass everything else."""
+    request = route.request
+    if (
+        request.resource_type in BLOCKED_RESOURCE_TYPES
+        or urlsplit(request.url).hostname in BLOCKED_HOSTS
+    ):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+@lru_cache(maxsize=1024)
+def _detect_priority(*texts: str) -> str:
+    """Return priority based on keyword presence in any of the texts (memoized).
+
+    Taking the parts separately avoids building a joined copy per call;
+    IGNORECASE folds case inside the regex engine, so nothing is lowercased.
+    """
+    if any(_P1_RE.search(text) for text in texts):
+        return "P1"
+    if any(_P2_RE.search(text) for text in texts):
+        return "P2"
+    return "P3"
+
+
+# Server-rendered pages embed their API payloads as HTML-escaped JSON in
+# <code id="bpr-guid-..."> blocks; reading them avoids a CDP round-trip per card.
+_BPR_RE = re.compile(r'<code[^>]*id="bpr-guid[^"]+"[^>]*>(.*?)</code>', re.DOTALL)
+
+
+def _embedded_notifications(html: str) -> list:
+    """
+    Extract notification cards from the JSON embedded in a page's HTML.
+
+    Returns (id, text, url) tuples in page order: the entity URN (falling
+    back to its trackingId), the headline text, and the actionTarget link.
+    Empty if the page carries no embedded notification data.
+    """
+    cards = []
+    seen = set()
+    for block in _BPR_RE.findall(html):
+        try:
+            data = json.loads(unescape(block))
+        except ValueError:
+            continue
+        entities = data.get("included", []) if isinstance(data, dict) else []
+        for ent in entities:
+            # e.g. com.linkedin.voyager.dash.identity.notifications.Card
+            if not isinstance(ent, dict) or "notification" not in ent.get("$type", "").lower():
+                continue
+            headline = ent.get("headline")
+            text = headline.get("text") if isinstance(headline, dict) else None
+            notif_id = ent.get("entityUrn") or ent.get("trackingId")
+            if not text or not notif_id or notif_id in seen:
+                continue
+            seen.add(notif_id)
+            url = ent.get("actionTarget")
+            cards.append((notif_id, text.strip(), url if isinstance(url, str) else ""))
+    return cards
+
+
+def _is_conversations_response(response) -> bool:
+    """expect_response predicate: the messaging page's conversation-list XHR."""
+    url = response.url
+    return response.ok and ("messaging/conversations" in url or "messengerConversations" in url)
+
+
+def _conversation_elements(data) -> list:
+    """The conversation list from a REST ({"elements"}) or GraphQL ({"data": ...}) payload.
+
+    Raises ValueError for a payload of neither shape, so the caller falls
+    back to the DOM rather than reporting no unread threads.
+    """
+    if isinstance(data, dict):
+        if isinstance(data.get("elements"), list):
+            return data["elements"]
+        for value in (data.get("data") or {}).values():
+            if isinstance(value, dict) and isinstance(value.get("elements"), list):
+                return value["elements"]
+    raise ValueError("unrecognised conversations payload")
+
+
+def _unread_from_api(data) -> list:
+    """
+    Extract {"sender", "preview"} for unread conversations in an API payload.
+
+    Reads participantNames / lastMessage.snippet, falling back to the older
+    participants[].miniProfile names and the first event's message body.
+    Conversations whose fields can't be found are skipped.
+    """
+    threads = []
+    for conv in _conversation_elements(data):
+        if not isinstance(conv, dict) or not conv.get("unreadCount"):
+            continue
+        names = conv.get("participantNames")
+        if isinstance(names, list):
+            names = ", ".join(names)
+        if not names:
+            profiles = [
+                member.get("miniProfile") or {}
+                for participant in conv.get("participants") or []
+                for member in participant.values() if isinstance(member, dict)
+            ]
+            names = ", ".join(
+                f"{p.get('firstName', '')} {p.get('lastName', '')}".strip() for p in profiles
+            )
+        preview = (conv.get("lastMessage") or {}).get("snippet")
+        if preview is None:
+            for event in (conv.get("events") or [])[:1]:
+                for content in (event.get("eventContent") or {}).values():
+                    if isinstance(content, dict):
+                        preview = (content.get("attributedBody") or {}).get("text")
+        if names or preview:
+            threads.append({"sender": names or None, "preview": preview})
+    return threads
+
+
+# page.eval_on_selector_all snippets: every field of the first n cards or
+# unread threads in one CDP round-trip instead of several per element.
+_NOTIF_CARDS_JS = """(els, n) => els.slice(0, n).map(e => ({
+    urn: e.getAttribute('data-urn'),
+    text: (e.innerText || '').trim(),
+}))"""
+_UNREAD_THREADS_JS = """(els, n) => els.slice(0, n).map(e => {
+    const text = sel => {
+        const el = e.querySelector(sel);
+        return el ? (el.innerText || '').trim() : null;
+    };
+    return {
+        sender: text('.msg-conversation-listitem__participant-names'),
+        preview: text('.msg-conversation-listitem__message-snippet'),
+    };
+})"""
+
+
+_PLAYWRIGHT = None
+
 
 def _load_playwright():
-    """Import Playwright — gives a clear error if not installed."""
+    """Import Playwright — gives a clear error if not installed.
+
+    Returns (sync_playwright, async_playwright). Imported on first use so
+    dry runs never pay for it, then cached for every later browser launch
+    and reply.
+    """
+    global _PLAYWRIGHT
+    if _PLAYWRIGHT is not None:
+        return _PLAYWRIGHT
     try:
+        from playwright.async_api import async_playwright
         from playwright.sync_api import sync_playwright
-        return sync_playwright
+        _PLAYWRIGHT = (sync_playwright, async_playwright)
+        return _PLAYWRIGHT
     except ImportError:
         print(
             "\n[ERROR] Playwright not installed.\n"
@@ -100,82 +375,209 @@ class LinkedInWatcher(BaseWatcher):
     Also handles posting approved business content to LinkedIn.
     """
 
-    def __init__(self, vault_path: str, session_path: str, dry_run: bool = False):
+    def __init__(
+        self,
+        vault_path: str,
+        session_path: str,
+        dry_run: bool = False,
+        legacy_session: bool = LEGACY_SESSION,
+    ):
         super().__init__(vault_path, check_interval=300)  # 5 min polling
         self.session_path = Path(session_path).resolve()
         self.dry_run = dry_run
-        self.processed_ids: set = self._load_processed_ids()
+        self.legacy_session = legacy_session
+        self.processed_ids: RotatingBloomFilter = self._load_processed_ids()
+        # Set when processed_ids changes; the snapshot is written once per
+        # cycle (create_action_files) and on close() rather than once per item.
+        self._dirty = False
         self.session_path.mkdir(parents=True, exist_ok=True)
+        # Long-lived async Playwright driver and browser context, shared by
+        # polling, posting and auto-replies (see _ensure_pages). Its objects
+        # are bound to this event loop, so the loop lives as long as the watcher.
+        self._loop = None
+        self._pw = None
+        self._browser = None
+        self._ctx = None
+        # (notifications page, messages page), kept open across polls
+        self._pages = None
+        self._breaker = CircuitBreaker(
+            failure_threshold=BREAKER_FAILURES, recovery_timeout=BREAKER_RECOVERY
+        )
 
         if dry_run:
             self.logger.info("DRY RUN mode enabled — no LinkedIn actions will be taken.")
 
-    def _load_processed_ids(self) -> set:
-        """Load previously seen notification IDs."""
+    def _load_processed_ids(self) -> RotatingBloomFilter:
+        """Load previously seen notification IDs.
+
+        Read from the .linkedin_state.bloom snapshot; IDs from the old
+        .linkedin_state.json list are folded in (and the list removed) on
+        first run.
+        """
+        bloom_file = self.vault_path / ".linkedin_state.bloom"
+        if bloom_file.exists():
+            try:
+                return RotatingBloomFilter.from_bytes(
+                    bloom_file.read_bytes(), PROCESSED_CAPACITY, PROCESSED_ERROR_RATE
+                )
+            except Exception:
+                pass
+        bloom = RotatingBloomFilter(capacity=PROCESSED_CAPACITY, error_rate=PROCESSED_ERROR_RATE)
         state_file = self.vault_path / ".linkedin_state.json"
         if state_file.exists():
             try:
-                return set(json.loads(state_file.read_text()))
+                bloom.update(json.loads(state_file.read_text()))
+                write_atomic(bloom_file, bloom.to_bytes())
+                state_file.unlink()
             except Exception:
-                return set()
-        return set()
+                pass
+        return bloom
 
     def _save_processed_ids(self):
-        """Persist seen IDs to avoid reprocessing."""
-        state_file = self.vault_path / ".linkedin_state.json"
-        ids_list = list(self.processed_ids)[-500:]
-        state_file.write_text(json.dumps(ids_list))
+        """Persist seen IDs to avoid reprocessing, if any were added since the last save."""
+        if not self._dirty:
+            return
+        write_atomic(self.vault_path / ".linkedin_state.bloom", self.processed_ids.to_bytes())
+        self._dirty = False
+
+    def create_action_files(self, items: list) -> list:
+        """Create a cycle's action files, then persist all their IDs at once."""
+        try:
+            return super().create_action_files(items)
+        finally:
+            self._save_processed_ids()
 
     def _get_browser_context(self, playwright, headless: bool = True):
-        """Launch (or resume) a persistent Chromium browser session."""
+        """Launch (or resume) a persistent Chromium browser session (legacy mode)."""
         return playwright.chromium.launch_persistent_context(
             str(self.session_path),
             headless=headless,
-            args=["--no-sandbox", "--disable-dev-shm-usage"],
-            user_agent=(
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/120.0.0.0 Safari/537.36"
-            ),
+            args=CHROMIUM_ARGS,
+            user_agent=USER_AGENT,
         )
 
+    def _run(self, coro):
+        """Run a coroutine on the watcher's long-lived event loop."""
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(coro)
+
+    async def _ensure_pages(self):
+        """Start Playwright and the browser context once; return its two pages.
+
+        Chromium start-up and profile load are paid on first use only; later
+        polls and posts reuse the warm browser and its already-open tabs.
+        Call close() when done; run() does so on exit.
+        """
+        if self._pages is None:
+            _, async_playwright = _load_playwright()
+            self._pw = await async_playwright().start()
+            if self.legacy_session:
+                self._ctx = await self._get_browser_context(self._pw)
+            else:
+                self._browser, self._ctx = await new_context_async(
+                    self._pw, self.session_path, args=CHROMIUM_ARGS, user_agent=USER_AGENT
+                )
+            # Missing selectors should fail fast rather than stall a poll for
+            # Playwright's 30s default; navigations get a little longer.
+            self._ctx.set_default_timeout(SELECTOR_TIMEOUT)
+            self._ctx.set_default_navigation_timeout(NAVIGATION_TIMEOUT)
+            await self._ctx.route("**/*", _block_unused)
+            pages = self._ctx.pages
+            first = pages[0] if pages else await self._ctx.new_page()
+            self._pages = (first, await self._ctx.new_page())
+        return self._pages
+
+    async def _close_context(self):
+        """Close the shared browser context and Playwright driver, ignoring errors.
+
+        In storage-state mode the session's cookies are saved first, so
+        tokens LinkedIn rotated while the browser was open carry over.
+        """
+        if self._ctx is not None:
+            if not self.legacy_session:
+                try:
+                    await save_storage_state_async(self._ctx, self.session_path)
+                except Exception:
+                    pass
+            try:
+                await self._ctx.close()
+            except Exception:
+                pass
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception:
+                pass
+        if self._pw is not None:
+            try:
+                await self._pw.stop()
+            except Exception:
+                pass
+        self._ctx = None
+        self._browser = None
+        self._pw = None
+        self._pages = None
+
+    def close(self):
+        """Save seen IDs, then close the shared browser and its event loop."""
+        self._save_processed_ids()
+        if self._loop is not None:
+            self._loop.run_until_complete(self._close_context())
+            self._loop.close()
+            self._loop = None
+
+    def run(self):
+        """Run the polling loop, closing the shared browser on exit."""
+        try:
+            super().run()
+        finally:
+            self.close()
+
     def setup_session(self):
         """
         Interactive setup: launches a visible browser so the user can
         log in and complete any 2FA/CAPTCHA. Saves the session for
         future headless runs.
         """
-        sync_playwright = _load_playwright()
+        sync_playwright, _ = _load_playwright()
         self.logger.info("Opening LinkedIn in visible browser for login/2FA...")
         self.logger.info(f"Session will be saved to: {self.session_path}")
         self.logger.info("Log in and complete any verification, then press Ctrl+C.")
 
         with sync_playwright() as p:
-            context = self._get_browser_context(p, headless=False)
+            if self.legacy_session:
+                context = self._get_browser_context(p, headless=False)
+            else:
+                _, context = new_context(
+                    p, self.session_path, headless=False, args=CHROMIUM_ARGS, user_agent=USER_AGENT
+                )
             page = context.pages[0] if context.pages else context.new_page()
             page.goto("https://www.linkedin.com/login", timeout=15000)
 
             try:
                 # Wait until user reaches the feed (logged in successfully)
                 page.wait_for_url("**/feed/**", timeout=300000)
+                if not self.legacy_session:
+                    save_storage_state(context, self.session_path)
                 self.logger.info("LinkedIn session established successfully!")
             except Exception:
                 self.logger.warning("Timed out waiting for login. Try again.")
             finally:
                 context.close()
 
-    def _is_logged_in(self, page) -> bool:
+    async def _is_logged_in(self, page) -> bool:
         """Check if the current session is authenticated to LinkedIn."""
         try:
-            page.goto("https://www.linkedin.com/feed/", timeout=15000)
-            page.wait_for_load_state("domcontentloaded", timeout=10000)
+            await page.goto("https://www.linkedin.com/feed/", timeout=15000)
+            await page.wait_for_load_state("domcontentloaded", timeout=10000)
             # Must be on the feed page itself, not redirected to login
             # (login redirect URL contains "feed" in query params, so check the path)
             return page.url.startswith("https://www.linkedin.com/feed")
         except Exception:
             return False
 
-    def _login(self, page) -> bool:
+    async def _login(self, page) -> bool:
         """Log in to LinkedIn using environment credentials."""
         email = os.getenv("LINKEDIN_EMAIL", "")
         password = os.getenv("LINKEDIN_PASSWORD", "")
@@ -188,12 +590,12 @@ class LinkedInWatcher(BaseWatcher):
             return False
 
         try:
-            page.goto("https://www.linkedin.com/login", timeout=15000)
-            page.wait_for_selector("#username", timeout=10000)
-            page.fill("#username", email)
-            page.fill("#password", password)
-            page.click("[data-litms-control-urn='login-submit']")
-            page.wait_for_load_state("domcontentloaded", timeout=15000)
+            await page.goto("https://www.linkedin.com/login", timeout=15000)
+            await page.wait_for_selector("#username", timeout=10000)
+            await page.fill("#username", email)
+            await page.fill("#password", password)
+            await page.click("[data-litms-control-urn='login-submit']")
+            await page.wait_for_load_state("domcontentloaded", timeout=15000)
 
             if "checkpoint" in page.url or "challenge" in page.url:
                 self.logger.warning(
@@ -216,90 +618,120 @@ class LinkedInWatcher(BaseWatcher):
         Scrape LinkedIn for new notifications and messages.
         Returns list of dicts with notification/message data.
         """
-        sync_playwright = _load_playwright()
-        items = []
+        if not self._breaker.can_proceed():
+            self.logger.info("LinkedIn circuit open — skipping check.")
+            return []
+        items = self._run(self._check_async())
+        if items:
+            self.logger.info(f"Found {len(items)} new LinkedIn items.")
+        return items
 
-        with sync_playwright() as p:
-            context = self._get_browser_context(p)
-            page = context.pages[0] if context.pages else context.new_page()
+    async def _check_async(self) -> list:
+        """Scrape notifications and messages concurrently on two tabs of one context."""
+        items = []
+        try:
+            notif_page, msg_page = await self._ensure_pages()
 
-            if not self._is_logged_in(page):
-                if not self._login(page):
-                    context.close()
+            if not await self._is_logged_in(notif_page):
+                if not await self._login(notif_page):
+                    self._breaker.record_failure()
                     return items
 
-            # --- Scrape Notifications ---
-            try:
-                page.goto("https://www.linkedin.com/notifications/", timeout=15000)
-                page.wait_for_selector(".nt-card-list", timeout=10000)
+            # Both scrapes are dominated by navigation and selector waits, so
+            # running them side by side roughly halves the cycle time.
+            results = await asyncio.gather(
+                self._scrape_notifications(notif_page),
+                self._scrape_messages(msg_page),
+                return_exceptions=True,
+            )
+            for kind, result in zip(("notifications", "messages"), results):
+                if isinstance(result, Exception):
+                    self.logger.warning(f"Could not scrape {kind}: {result}")
+                else:
+                    items.extend(result)
+            if all(isinstance(result, Exception) for result in results):
+                self._breaker.record_failure()
+            else:
+                self._breaker.record_success()
 
-                notif_cards = page.query_selector_all(
-                    ".nt-card-list .nt-card__text-container"
-                )
-                for card in notif_cards[:10]:  # Process top 10
-                    try:
-                        text = card.inner_text().strip()
-                        notif_id = card.get_attribute("data-urn") or f"notif_{hash(text)}"
-                        if notif_id not in self.processed_ids and len(text) > 10:
-                            items.append({
-                                "type": "notification",
-                                "id": notif_id,
-                                "text": text[:500],
-                                "priority": self._detect_priority(text),
-                            })
-                    except Exception:
-                        pass
-
-            except Exception as e:
-                self.logger.warning(f"Could not scrape notifications: {e}")
-
-            # --- Scrape Messages (unread threads) ---
-            try:
-                page.goto("https://www.linkedin.com/messaging/", timeout=15000)
-                page.wait_for_selector(".msg-conversations-container", timeout=10000)
+        except Exception as e:
+            self.logger.error(f"LinkedIn check failed: {e}")
+            self._breaker.record_failure()
+            # Browser may have crashed — relaunch it on the next cycle
+            await self._close_context()
 
-                unread_threads = page.query_selector_all(
-                    ".msg-conversation-listitem--unread"
-                )
-                for thread in unread_threads[:5]:  # Process top 5 unread
-                    try:
-                        sender_el = thread.query_selector(".msg-conversation-listitem__participant-names")
-                        preview_el = thread.query_selector(".msg-conversation-listitem__message-snippet")
-                        sender = sender_el.inner_text().strip() if sender_el else "Unknown"
-                        preview = preview_el.inner_text().strip() if preview_el else ""
-                        thread_id = f"msg_{hash(sender + preview)}"
-
-                        if thread_id not in self.processed_ids:
-                            priority = self._detect_priority(preview + " " + sender)
-                            items.append({
-                                "type": "message",
-                                "id": thread_id,
-                                "sender": sender,
-                                "preview": preview[:300],
-                                "priority": priority,
-                            })
-                    except Exception:
-                        pass
-
-            except Exception as e:
-                self.logger.warning(f"Could not scrape messages: {e}")
-
-            context.close()
+        return items
 
-        if items:
-            self.logger.info(f"Found {len(items)} new LinkedIn items.")
+    async def _scrape_notifications(self, page) -> list:
+        """Return new notification items from the notifications page."""
+        items = []
+        await page.goto("https://www.linkedin.com/notifications/")
+
+        # One content() call and a JSON parse instead of two CDP calls per card
+        cards = _embedded_notifications(await page.content())
+        if not cards:
+            cards = await self._dom_notifications(page)
+
+        for notif_id, text, url in cards[:10]:  # Process top 10
+            if notif_id not in self.processed_ids and len(text) > 10:
+                items.append({
+                    "type": "notification",
+                    "id": notif_id,
+                    "text": text[:500],
+                    "url": url,
+                    "priority": _detect_priority(text),
+                })
         return items
 
-    def _detect_priority(self, text: str) -> str:
-        """Return priority based on keyword presence in text."""
-        lower = text.lower()
-        for kw in PRIORITY_KEYWORDS[:5]:  # P0 keywords
-            if kw in lower:
-                return "P1"
-        for kw in PRIORITY_KEYWORDS[5:]:  # P1 keywords
-            if kw in lower:
-                return "P2"
-        return "P3"
+    async def _dom_notifications(self, page) -> list:
+        """Fallback: read notification cards from the rendered DOM."""
+        await page.locator(".nt-card-list").first.wait_for(state="attached")
+
+        cards = await page.eval_on_selector_all(
+            ".nt-card-list .nt-card__text-container", _NOTIF_CARDS_JS, 10
+        )
+        return [
+            (card["urn"] or f"notif_{content_id(card['text'])}", card["text"], "")
+            for card in cards
+        ]
+
+    async def _scrape_messages(self, page) -> list:
+        """Return unread message-thread items from the messaging page."""
+        items = []
+        # The thread list arrives as a JSON XHR; reading it skips the DOM
+        # entirely. If it doesn't come (or changes shape), scrape the DOM.
+        unread_threads = None
+        try:
+            async with page.expect_response(
+                _is_conversations_response, timeout=NAVIGATION_TIMEOUT
+            ) as response_info:
+                await page.goto("https://www.linkedin.com/messaging/")
+            response = await response_info.value
+            unread_threads = _unread_from_api(await response.json())
+        except Exception as e:
+            self.logger.debug(f"No conversations payload, falling back to DOM: {e}")
+
+        if unread_threads is None:
+            await page.locator(".msg-conversations-container").first.wait_for(state="attached")
+            unread_threads = await page.eval_on_selector_all(
+                ".msg-conversation-listitem--unread", _UNREAD_THREADS_JS, 5
+            )
+
+        for thread in unread_threads[:5]:  # Process top 5 unread
+            sender = thread["sender"] or "Unknown"
+            preview = thread["preview"] or ""
+            thread_id = f"msg_{content_id(sender + preview)}"
+
+            if thread_id not in self.processed_ids:
+                priority = _detect_priority(preview, sender)
+                items.append({
+                    "type": "message",
+                    "id": thread_id,
+                    "sender": sender,
+                    "preview": preview[:300],
+                    "priority": priority,
+                })
+        return items
 
     def create_action_file(self, item: dict) -> Path:
         """Create a .md action file for a LinkedIn notification or message.
@@ -308,7 +740,8 @@ class LinkedInWatcher(BaseWatcher):
         sent immediately and a log entry is written to Done/ instead of
         Needs_Action/ — no human review needed.
         """
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        now = datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
         item_type = item.get("type", "notification")
         priority = item.get("priority", "P2")
         item_id = str(item.get("id", timestamp))
@@ -325,21 +758,19 @@ class LinkedInWatcher(BaseWatcher):
             if self.dry_run:
                 self.logger.info(f"[DRY RUN] Would auto-reply to LinkedIn message from: {sender}")
             else:
-                success = LinkedInWatcher.send_message_reply(
-                    str(self.session_path), sender, LINKEDIN_AUTO_REPLY
-                )
-                done_file.write_text(
-                    f"---\ntype: linkedin_auto_replied\nsender: {sender}\n"
-                    f"created: {datetime.now().isoformat()}\nauto_reply_sent: {success}\n---\n\n"
-                    f"Auto-replied to LinkedIn message (no business keywords detected).\n\n"
-                    f"**Reply sent:** {LINKEDIN_AUTO_REPLY}\n"
-                )
+                success = self._send_reply(sender, LINKEDIN_AUTO_REPLY)
+                write_file(done_file, _AUTO_REPLIED_TEMPLATE.format_map({
+                    "sender": sender,
+                    "created": now.isoformat(),
+                    "success": success,
+                    "reply": LINKEDIN_AUTO_REPLY,
+                }))
                 self.log_event("linkedin_auto_reply_sent", {
                     "sender": sender, "success": success, "file": filename,
                 })
 
             self.processed_ids.add(item_id)
-            self._save_processed_ids()
+            self._dirty = True
             return done_dir / filename
         # ───────────────────────────────────────────────────────────────────
 
@@ -351,71 +782,25 @@ class LinkedInWatcher(BaseWatcher):
             return action_file
 
         if item_type == "message":
-            content = f"""---
-type: linkedin_message
-source: linkedin
-sender: {item.get('sender', 'Unknown')}
-preview: "{item.get('preview', '')[:100]}"
-received: {datetime.now().isoformat()}
-priority: {priority}
-status: pending
-assigned_to: claude_code
----
-
-## LinkedIn Message from {item.get('sender', 'Unknown')}
-
-**Priority:** {priority}
-
-### Message Preview
-
-> {item.get('preview', '')}
-
-### Suggested Actions
-
-- [ ] Read full message on LinkedIn
-- [ ] Draft reply → create approval file in /Pending_Approval/
-- [ ] If sales opportunity → create Plan in /Plans/
-- [ ] Archive after processing
-
-### Notes
-
-_Add context or action taken here._
-
----
-*Created by: LinkedInWatcher · Silver Tier*
-"""
+            preview = item.get("preview", "")
+            content = _MESSAGE_TEMPLATE.format_map({
+                "sender": sender,
+                "preview": preview,
+                "preview_short": preview[:100],
+                "received": now.isoformat(),
+                "priority": priority,
+            })
         else:  # notification
-            content = f"""---
-type: linkedin_notification
-source: linkedin
-received: {datetime.now().isoformat()}
-priority: {priority}
-status: pending
-assigned_to: claude_code
----
-
-## LinkedIn Notification
-
-**Priority:** {priority}
-
-### Notification Text
-
-> {item.get('text', '')}
-
-### Suggested Actions
-
-- [ ] Review notification on LinkedIn
-- [ ] Take appropriate action (reply, like, connect)
-- [ ] If action needed → create approval file in /Pending_Approval/
-- [ ] Archive after processing
-
----
-*Created by: LinkedInWatcher · Silver Tier*
-"""
-
-        action_file.write_text(content)
+            content = _NOTIFICATION_TEMPLATE.format_map({
+                "text": item.get("text", ""),
+                "link": f"\n**Link:** {item['url']}\n" if item.get("url") else "",
+                "received": now.isoformat(),
+                "priority": priority,
+            })
+
+        write_file(action_file, content)
         self.processed_ids.add(item_id)
-        self._save_processed_ids()
+        self._dirty = True
 
         self.log_event("linkedin_item_detected", {
             "type": item_type,
@@ -447,58 +832,15 @@ assigned_to: claude_code
             self.logger.info(f"[DRY RUN] Would post to LinkedIn:\n{full_content[:200]}...")
             return True
 
-        sync_playwright = _load_playwright()
-        success = False
-
-        with sync_playwright() as p:
-            context = self._get_browser_context(p)
-            page = context.pages[0] if context.pages else context.new_page()
-
-            if not self._is_logged_in(page):
-                if not self._login(page):
-                    context.close()
-                    return False
-
-            try:
-                # Navigate to feed and open the post composer
-                page.goto("https://www.linkedin.com/feed/", timeout=15000)
-                page.wait_for_selector("button:has-text('Start a post')", timeout=10000)
-
-                # Click "Start a post"
-                page.click("button:has-text('Start a post')")
-                page.wait_for_selector(".ql-editor", timeout=10000)
-
-                # Type the content using clipboard paste (fast + reliable)
-                editor = page.locator(".ql-editor").first
-                editor.click()
-                page.keyboard.type(full_content)
-
-                # Wait a moment before submitting
-                time.sleep(2)
-
-                # Click "Post" button
-                post_btn = page.query_selector(
-                    "[data-control-name='share.post']"
-                ) or page.query_selector(".share-actions__primary-action")
-
-                if post_btn:
-                    post_btn.click()
-                    # Wait for composer to close (indicates post submitted)
-                    try:
-                        page.wait_for_selector(".ql-editor", state="hidden", timeout=30000)
-                    except Exception:
-                        pass  # Composer may already be gone
-                    time.sleep(3)
-                    success = True
-                    self.logger.info("LinkedIn post published successfully.")
-                else:
-                    self.logger.error("Could not find LinkedIn post button.")
+        if not self._breaker.can_proceed():
+            self.logger.warning("LinkedIn circuit open — not posting.")
+            return False
 
-            except Exception as e:
-                self.logger.error(f"LinkedIn post failed: {e}")
-                success = False
-            finally:
-                context.close()
+        success = self._run(self._post_async(full_content))
+        if success:
+            self._breaker.record_success()
+        else:
+            self._breaker.record_failure()
 
         self.log_event("linkedin_post", {
             "content_preview": full_content[:100],
@@ -507,8 +849,61 @@ assigned_to: claude_code
 
         return success
 
+    async def _post_async(self, full_content: str) -> bool:
+        """Publish ``full_content`` from the shared context's first tab."""
+        page, _ = await self._ensure_pages()
+        if not await self._is_logged_in(page):
+            if not await self._login(page):
+                return False
+
+        success = False
+        try:
+            # Navigate to feed and open the post composer
+            await page.goto("https://www.linkedin.com/feed/")
+
+            # Click "Start a post" (locator actions auto-wait for the element)
+            await page.locator("button:has-text('Start a post')").first.click()
+
+            # Type the content using clipboard paste (fast + reliable)
+            editor = page.locator(".ql-editor").first
+            await editor.click()
+            await page.keyboard.type(full_content)
+
+            # Post button enables once the composer has registered the text
+            post_btn = page.locator(
+                "[data-control-name='share.post']:enabled, .share-actions__primary-action:enabled"
+            ).first
+            try:
+                await post_btn.wait_for()
+            except Exception:
+                post_btn = None
+
+            if post_btn:
+                await post_btn.click()
+                # Wait for composer to close (indicates post submitted)
+                try:
+                    await editor.wait_for(state="hidden", timeout=30000)
+                except Exception:
+                    pass  # Composer may already be gone
+                success = True
+                self.logger.info("LinkedIn post published successfully.")
+            else:
+                self.logger.error("Could not find LinkedIn post button.")
+
+        except Exception as e:
+            self.logger.error(f"LinkedIn post failed: {e}")
+            success = False
+
+        return success
+
     @classmethod
-    def send_message_reply(cls, session_path: str, sender: str, reply_text: str) -> bool:
+    def send_message_reply(
+        cls,
+        session_path: str,
+        sender: str,
+        reply_text: str,
+        legacy_session: bool = LEGACY_SESSION,
+    ) -> bool:
         """
         Send a reply to a LinkedIn message thread.
 
@@ -516,15 +911,16 @@ assigned_to: claude_code
         and sends the reply text.
 
         Args:
-            session_path: Path to persistent Chromium session directory
+            session_path: Path to the browser session directory
             sender:       Display name of the message sender (used to find the thread)
             reply_text:   Text to send as the reply
+            legacy_session: Open session_path as a full Chromium profile
+                          instead of loading its state.json
 
         Returns:
             True if reply was sent successfully, False otherwise
         """
-        sync_playwright = _load_playwright()
-        success = False
+        _, async_playwright = _load_playwright()
         logger = logging.getLogger("LinkedInWatcher")
 
         session = Path(session_path)
@@ -532,67 +928,119 @@ assigned_to: claude_code
             logger.error(f"LinkedIn session not found: {session_path}")
             return False
 
-        with sync_playwright() as p:
-            context = p.chromium.launch_persistent_context(
-                str(session),
-                headless=True,
-                args=["--no-sandbox", "--disable-dev-shm-usage"],
-                user_agent=(
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/120.0.0.0 Safari/537.36"
-                ),
-            )
-            page = context.pages[0] if context.pages else context.new_page()
-            try:
-                page.goto("https://www.linkedin.com/messaging/", timeout=15000)
-                page.wait_for_selector(".msg-conversations-container", timeout=10000)
-
-                # Find the thread matching the sender name
-                threads = page.query_selector_all(".msg-conversation-listitem")
-                target_thread = None
-                for thread in threads:
-                    try:
-                        name_el = thread.query_selector(".msg-conversation-listitem__participant-names")
-                        if name_el and sender.lower() in name_el.inner_text().lower():
-                            target_thread = thread
-                            break
-                    except Exception:
-                        continue
-
-                if not target_thread:
-                    logger.error(f"Could not find LinkedIn thread for sender: {sender}")
-                    context.close()
-                    return False
-
-                target_thread.click()
-                page.wait_for_selector(".msg-form__contenteditable", timeout=10000)
-
-                # Type the reply
-                input_box = page.locator(".msg-form__contenteditable").first
-                input_box.click()
-                page.keyboard.type(reply_text)
-                time.sleep(1)
-
-                # Click send button
-                send_btn = page.query_selector(".msg-form__send-button")
-                if send_btn:
-                    send_btn.click()
-                    time.sleep(2)
-                    success = True
-                    logger.info(f"LinkedIn reply sent to: {sender}")
+        async def _send():
+            async with async_playwright() as p:
+                if legacy_session:
+                    context = await p.chromium.launch_persistent_context(
+                        str(session), headless=True, args=CHROMIUM_ARGS, user_agent=USER_AGENT,
+                    )
                 else:
-                    logger.error("Could not find LinkedIn send button")
+                    _, context = await new_context_async(
+                        p, session, args=CHROMIUM_ARGS, user_agent=USER_AGENT
+                    )
+                page = context.pages[0] if context.pages else await context.new_page()
+                try:
+                    return await cls._reply_on_page(page, sender, reply_text, logger)
+                finally:
+                    await context.close()
+
+        return asyncio.run(_send())
+
+    def _send_reply(self, sender: str, reply_text: str) -> bool:
+        """Reply to a message thread in the watcher's already-open context.
+
+        Reuses the shared messages tab rather than send_message_reply(), which
+        would launch a second browser (and, in legacy mode, a persistent
+        profile can only be held by one Chromium at a time).
+        """
+        async def _send():
+            _, msg_page = await self._ensure_pages()
+            return await self._reply_on_page(msg_page, sender, reply_text, self.logger)
 
-            except Exception as e:
-                logger.error(f"LinkedIn send_message_reply failed: {e}")
-            finally:
-                context.close()
+        return self._run(_send())
+
+    @staticmethod
+    async def _reply_on_page(page, sender: str, reply_text: str, logger) -> bool:
+        """Open the sender's thread on ``page`` and send ``reply_text``."""
+        success = False
+        try:
+            await page.goto("https://www.linkedin.com/messaging/", timeout=15000)
+            await page.wait_for_selector(".msg-conversations-container", timeout=10000)
+
+            # Find the thread matching the sender name
+            threads = await page.query_selector_all(".msg-conversation-listitem")
+            target_thread = None
+            for thread in threads:
+                try:
+                    name_el = await thread.query_selector(".msg-conversation-listitem__participant-names")
+                    if name_el and sender.lower() in (await name_el.inner_text()).lower():
+                        target_thread = thread
+                        break
+                except Exception:
+                    continue
+
+            if not target_thread:
+                logger.error(f"Could not find LinkedIn thread for sender: {sender}")
+                return False
+
+            await target_thread.click()
+            await page.wait_for_selector(".msg-form__contenteditable", timeout=10000)
+
+            # Type the reply
+            input_box = page.locator(".msg-form__contenteditable").first
+            await input_box.click()
+            await page.keyboard.type(reply_text)
+            await asyncio.sleep(1)
+
+            # Click send button
+            send_btn = await page.query_selector(".msg-form__send-button")
+            if send_btn:
+                await send_btn.click()
+                await asyncio.sleep(2)
+                success = True
+                logger.info(f"LinkedIn reply sent to: {sender}")
+            else:
+                logger.error("Could not find LinkedIn send button")
+
+        except Exception as e:
+            logger.error(f"LinkedIn send_message_reply failed: {e}")
 
         return success
 
 
-def post_from_approved_file(vault_path: str, post_file: Path, dry_run: bool = False):
+def _split_frontmatter(raw: str) -> tuple:
+    """
+    Split a markdown file into (frontmatter dict, stripped body).
+
+    Reads line by line up to the closing "---"; each "key: value" line
+    becomes a string entry. Handles CRLF files. Without frontmatter the
+    dict is empty and the whole text is the body.
+    """
+    lines = raw.splitlines(keepends=True)
+    if not lines or lines[0].strip() != "---":
+        return {}, raw
+    end = next((i for i in range(1, len(lines)) if lines[i].strip() == "---"), None)
+    if end is None:
+        return {}, raw
+    frontmatter = {}
+    for line in lines[1:end]:
+        key, sep, value = line.partition(":")
+        if sep:
+            frontmatter[key.strip()] = value.strip()
+    return frontmatter, "".join(lines[end + 1:]).strip()
+
+
+def _flow_list(value: str) -> list:
+    """Parse a YAML flow list like [AI, "Business"] into its non-empty items."""
+    if not (value.startswith("[") and value.endswith("]")):
+        return []
+    items = (item.strip().strip("'\"") for item in value[1:-1].split(","))
+    return [item for item in items if item]
+
+
+def post_from_approved_file(
+    vault_path: str, post_file: Path, dry_run: bool = False, legacy_session: bool = LEGACY_SESSION
+):
     """
     Read an approved LinkedIn post file and publish it.
 
@@ -601,8 +1049,6 @@ def post_from_approved_file(vault_path: str, post_file: Path, dry_run: bool = Fa
         hashtags: [AI, Business, Automation]
     And the post body below the --- separator.
     """
-    import re
-
     logger = logging.getLogger("LinkedInPoster")
 
     if not post_file.exists():
@@ -612,24 +1058,19 @@ def post_from_approved_file(vault_path: str, post_file: Path, dry_run: bool = Fa
     raw = post_file.read_text()
 
     # Parse frontmatter
-    hashtags = []
-    content = raw
-    fm_match = re.match(r"^---\n(.*?)\n---\n(.*)", raw, re.DOTALL)
-    if fm_match:
-        fm_text = fm_match.group(1)
-        content = fm_match.group(2).strip()
-        # Extract hashtags
-        ht_match = re.search(r"hashtags:\s*\[(.*?)\]", fm_text)
-        if ht_match:
-            hashtags = [h.strip().strip("'\"") for h in ht_match.group(1).split(",")]
+    frontmatter, content = _split_frontmatter(raw)
+    hashtags = _flow_list(frontmatter.get("hashtags", ""))
 
     if not content:
         logger.error("Post file has no content to publish.")
         return False
 
     session_path = os.getenv("LINKEDIN_SESSION_PATH", ".linkedin_session")
-    watcher = LinkedInWatcher(vault_path, session_path, dry_run=dry_run)
-    success = watcher.post_to_linkedin(content, hashtags=hashtags)
+    watcher = LinkedInWatcher(vault_path, session_path, dry_run=dry_run, legacy_session=legacy_session)
+    try:
+        success = watcher.post_to_linkedin(content, hashtags=hashtags)
+    finally:
+        watcher.close()
 
     if success:
         # Move post file to Done/
@@ -661,7 +1102,8 @@ Examples:
 Environment variables:
   LINKEDIN_EMAIL          LinkedIn login email
   LINKEDIN_PASSWORD       LinkedIn login password
-  LINKEDIN_SESSION_PATH   Persistent browser session path (default: .linkedin_session)
+  LINKEDIN_SESSION_PATH   Browser session path (default: .linkedin_session)
+  LINKEDIN_LEGACY_SESSION=true  Same as --legacy-session
   DRY_RUN=true            Enable dry-run mode
         """,
     )
@@ -686,6 +1128,12 @@ Environment variables:
         default=os.getenv("LINKEDIN_SESSION_PATH", ".linkedin_session"),
         help="Path for persistent browser session",
     )
+    parser.add_argument(
+        "--legacy-session",
+        action="store_true",
+        default=LEGACY_SESSION,
+        help="Use the full Chromium profile in --session-path instead of its state.json",
+    )
     parser.add_argument(
         "--once",
         action="store_true",
@@ -708,23 +1156,34 @@ Environment variables:
 
     # -- Setup mode: interactive login + 2FA --
     if args.setup:
-        watcher = LinkedInWatcher(str(vault_path), args.session_path, dry_run=args.dry_run)
+        watcher = LinkedInWatcher(
+            str(vault_path), args.session_path,
+            dry_run=args.dry_run, legacy_session=args.legacy_session,
+        )
         watcher.setup_session()
         sys.exit(0)
 
     # -- Post mode: publish a pre-approved LinkedIn post --
     if args.post_file:
         post_file = Path(args.post_file)
-        success = post_from_approved_file(str(vault_path), post_file, dry_run=args.dry_run)
+        success = post_from_approved_file(
+            str(vault_path), post_file,
+            dry_run=args.dry_run, legacy_session=args.legacy_session,
+        )
         sys.exit(0 if success else 1)
 
     # -- Watch mode: monitor LinkedIn for new items --
-    watcher = LinkedInWatcher(str(vault_path), args.session_path, dry_run=args.dry_run)
+    watcher = LinkedInWatcher(
+        str(vault_path), args.session_path,
+        dry_run=args.dry_run, legacy_session=args.legacy_session,
+    )
 
     if args.once:
-        items = watcher.check_for_updates()
-        for item in items:
-            watcher.create_action_file(item)
+        try:
+            items = watcher.check_for_updates()
+            watcher.create_action_files(items)
+        finally:
+            watcher.close()
         print(f"Found and processed {len(items)} LinkedIn items.")
     else:
         watcher.run()
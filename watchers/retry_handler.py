@@ -4,12 +4,13 @@ Gold Tier: Error recovery and graceful degradation.
 """
 
 import time
+import random
 import logging
+import threading
 from functools import wraps
 
 logger = logging.getLogger(__name__)
 
-
 class TransientError(Exception):
     """Raised for temporary, retryable failures (network timeouts, rate limits, etc.)."""
     pass
@@ -25,7 +26,13 @@ class DataError(Exception):
     pass
 
 
-def with_retry(max_attempts: int = 3, base_delay: float = 1.0, max_delay: float = 60.0):
+def with_retry(
+    max_attempts: int = 3,
+    base_delay: float = 1.0,
+    max_delay: float = 60.0,
+    stop_event: threading.Event | None = None,
+    jitter: bool = True,
+):
     """
     Decorator: retry a function on TransientError with exponential backoff.
 
@@ -38,7 +45,16 @@ def with_retry(max_attempts: int = 3, base_delay: float = 1.0, max_delay: float
         max_attempts: Total attempts before giving up.
         base_delay:   Initial wait between retries (seconds).
         max_delay:    Cap for exponential backoff (seconds).
+        stop_event:   Event that cancels the backoff wait and re-raises the
+                      last error, e.g. a watcher's _stop_event (default:
+                      none, the backoff always runs its course).
+        jitter:       Wait a random delay in [cap/2, cap] instead of exactly
+                      cap, so watchers rate-limited together don't retry in
+                      lockstep. Pass False for deterministic delays.
     """
+    # Never set: without a stop_event the wait is a plain sleep
+    event = stop_event if stop_event is not None else threading.Event()
+
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
@@ -54,11 +70,15 @@ def with_retry(max_attempts: int = 3, base_delay: float = 1.0, max_delay: float
                         )
                         raise
                     delay = min(base_delay * (2 ** (attempt - 1)), max_delay)
+                    if jitter:
+                        delay = random.uniform(delay / 2, delay)
                     logger.warning(
                         f"[retry] {func.__name__} attempt {attempt}/{max_attempts} failed: {e}. "
                         f"Retrying in {delay:.1f}s..."
                     )
-                    time.sleep(delay)
+                    if event.wait(delay):
+                        logger.info(f"[retry] {func.__name__} retry cancelled by shutdown")
+                        raise
                 except (AuthenticationError, DataError):
                     # Non-retryable — propagate immediately
                     raise
@@ -90,6 +110,9 @@ class CircuitBreaker:
             except Exception as e:
                 cb.record_failure()
                 raise
+
+    Timing uses time.monotonic(), so wall-clock jumps (NTP, DST, suspend)
+    can't hold the breaker open or cut its recovery short.
     """
 
     CLOSED = "closed"
@@ -106,7 +129,7 @@ class CircuitBreaker:
     @property
     def state(self):
         if self._state == self.OPEN:
-            if time.time() - self._last_failure_time >= self.recovery_timeout:
+            if time.monotonic() - self._last_failure_time >= self.recovery_timeout:
                 self._state = self.HALF_OPEN
                 logger.info("[circuit_breaker] State → HALF_OPEN (testing recovery)")
         return self._state
@@ -122,7 +145,7 @@ class CircuitBreaker:
 
     def record_failure(self):
         self._failure_count += 1
-        self._last_failure_time = time.time()
+        self._last_failure_time = time.monotonic()
         if self._failure_count >= self.failure_threshold:
             if self._state != self.OPEN:
                 logger.warning(
@@ -144,20 +167,28 @@ class RateLimiter:
 
     def __init__(self, max_per_hour: int = 10):
         self.max_per_hour = max_per_hour
-        self._tokens = max_per_hour
-        self._last_refill = time.time()
+        # Integer bookkeeping: tokens in thousandths, time in nanoseconds, so
+        # refills never accumulate float rounding however long the bucket lives.
+        self._capacity_m = max_per_hour * 1000
+        self._tokens_m = self._capacity_m
+        self._last_refill_ns = time.monotonic_ns()
+        # Refill not yet worth a whole millitoken, in ns * max_per_hour units
+        self._refill_carry = 0
 
     def allow(self) -> bool:
-        now = time.time()
-        elapsed = now - self._last_refill
-        # Refill proportionally (token bucket)
-        refill = (elapsed / 3600.0) * self.max_per_hour
-        if refill > 0:
-            self._tokens = min(self.max_per_hour, self._tokens + refill)
-            self._last_refill = now
-
-        if self._tokens >= 1:
-            self._tokens -= 1
+        now = time.monotonic_ns()
+        # Refill proportionally (token bucket): max_per_hour * 1000 per 3600e9 ns.
+        # The remainder is carried over, so frequent polls lose no refill time.
+        refill_m, self._refill_carry = divmod(
+            (now - self._last_refill_ns) * self.max_per_hour + self._refill_carry,
+            3_600_000_000,
+        )
+        self._last_refill_ns = now
+        if refill_m:
+            self._tokens_m = min(self._capacity_m, self._tokens_m + refill_m)
+
+        if self._tokens_m >= 1000:
+            self._tokens_m -= 1000
             return True
 
         logger.warning(
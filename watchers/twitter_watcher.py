@@ -17,12 +17,13 @@ Usage:
     python3 watchers/twitter_watcher.py --vault AI_Employee_Vault
 
 Environment variables:
-    TWITTER_SESSION_PATH  — path to Playwright persistent context dir
+    TWITTER_SESSION_PATH  — session dir (state.json login; legacy Chromium profile)
     TWITTER_HANDLE        — your @handle (without @) for mention detection
     DRY_RUN               — if "true", creates action files but doesn't navigate
 """
 
 import argparse
+import asyncio
 import json
 import logging
 import os
@@ -33,9 +34,13 @@ from pathlib import Path
 
 # Add parent dir to path for base_watcher import
 sys.path.insert(0, str(Path(__file__).parent))
-from base_watcher import BaseWatcher
+from base_watcher import BaseWatcher, content_id, write_atomic, write_file
+from bloom_filter import RotatingBloomFilter
+from browser_session import new_context, new_context_async, save_storage_state, save_storage_state_async
+from keyword_matcher import KeywordMatcher
 
 try:
+    from playwright.async_api import async_playwright
     from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
     PLAYWRIGHT_AVAILABLE = True
 except ImportError:
@@ -52,10 +57,81 @@ BUSINESS_KEYWORDS = [
     "partnership", "consulting", "service",
 ]
 
+_KEYWORD_MATCHER = KeywordMatcher(BUSINESS_KEYWORDS)
+
+# Run in the page via eval_on_selector_all: one round-trip returns every row
+# instead of an inner_text()/query_selector() call per element.
+_TWEET_ROWS_JS = """els => els.slice(0, 20).map(t => {
+    const a = t.querySelector('a[href*="/status/"]');
+    const m = a && a.getAttribute('href').match(/\\/status\\/(\\d+)/);
+    return {id: m && m[1], text: t.innerText.slice(0, 500)};
+})"""
+_CONVERSATION_ROWS_JS = """els => els.slice(0, 10).map(c => {
+    const a = c.querySelector('a[href*="/messages/"]');
+    return {href: a && a.getAttribute('href'), text: c.innerText};
+})"""
+
+
+def _dm_id(href, text: str) -> str:
+    """
+    Processed-ID for a DM conversation row: thread plus latest message.
+
+    The thread is the last segment of its /messages/ link (or, without one,
+    the sender line), and the row's last line is the newest message's
+    preview, so a new message in a known thread gets a new ID. content_id()
+    is stable across runs, unlike the per-process hash(). The relative
+    timestamp line is left out so the ID doesn't change as it ages.
+    """
+    lines = [line.strip() for line in text.strip().splitlines() if line.strip()]
+    preview = lines[-1] if lines else ""
+    if href:
+        thread = href.rstrip("/").rsplit("/", 1)[-1]
+    else:
+        thread = content_id(lines[0] if lines else "")
+    return f"dm_{thread}_{content_id(preview)}"
+
+
+# Action file body, filled in per item with str.format_map
+_ACTION_TEMPLATE = """---
+type: twitter_{type}
+platform: twitter_x
+id: {id}
+received: {received}
+priority: {priority}
+status: pending
+keywords_detected: {keywords}
+url: {url}
+---
+
+## Twitter/X {title} Received
+
+**Content:**
+{text}
+
+## Suggested Actions
+- [ ] Review the {type}
+- [ ] Draft reply (create in /Pending_Approval/ for HITL)
+- [ ] Follow up if business opportunity detected
+- [ ] Archive after processing
+
+## Keywords Detected
+{keywords_section}
+"""
+
 TWITTER_URL = "https://x.com"
 NOTIFICATIONS_URL = "https://x.com/notifications/mentions"
 DM_URL = "https://x.com/messages"
 
+CHROMIUM_ARGS = ["--no-sandbox", "--disable-dev-shm-usage"]
+
+# Processed tweet/DM IDs live in a two-generation Bloom filter (~720 KB on
+# disk) that rotates every PROCESSED_CAPACITY IDs, so the last 100k are always
+# remembered and a new item is mistaken for a seen one ~1 in 500k times.
+PROCESSED_CAPACITY = 100_000
+PROCESSED_ERROR_RATE = 1e-6
+# New IDs are appended to a log, folded into the filter snapshot this often
+COMPACT_EVERY = 500
+
 
 class TwitterWatcher(BaseWatcher):
     """Playwright-based Twitter/X watcher."""
@@ -65,24 +141,87 @@ class TwitterWatcher(BaseWatcher):
         self.session_path = Path(session_path)
         self.handle = handle.lstrip("@")
         self.dry_run = os.getenv("DRY_RUN", "false").lower() == "true"
-        self._processed_ids: set = self._load_processed()
-
-    def _load_processed(self) -> set:
-        state_file = self.vault_path / ".twitter_state.json"
-        if state_file.exists():
+        self._log_count = 0  # IDs in .twitter_state.log since the last snapshot
+        self._processed_ids: RotatingBloomFilter = self._load_processed()
+        self._unsaved = []  # IDs not yet appended to .twitter_state.log
+        # Long-lived async browser, reused across polling cycles (see
+        # _ensure_browser). Its objects are bound to this event loop, so the
+        # loop lives as long as the watcher instead of one asyncio.run() per cycle.
+        self._loop = None
+        self._pw = None
+        self._browser = None
+        self._ctx = None
+        self._page = None
+        self._dm_page = None
+
+    def _load_processed(self) -> RotatingBloomFilter:
+        """Load processed tweet/DM IDs.
+
+        The .twitter_state.bloom snapshot is replayed with the IDs appended to
+        .twitter_state.log since it was written. IDs from the old
+        .twitter_state.json list are folded in (and the list removed) on
+        first run.
+        """
+        bloom = None
+        bloom_file = self.vault_path / ".twitter_state.bloom"
+        if bloom_file.exists():
             try:
-                data = json.loads(state_file.read_text())
-                return set(data.get("processed_ids", []))
+                bloom = RotatingBloomFilter.from_bytes(
+                    bloom_file.read_bytes(), PROCESSED_CAPACITY, PROCESSED_ERROR_RATE
+                )
             except Exception:
                 pass
-        return set()
+        if bloom is None:
+            bloom = RotatingBloomFilter(capacity=PROCESSED_CAPACITY, error_rate=PROCESSED_ERROR_RATE)
+            state_file = self.vault_path / ".twitter_state.json"
+            if state_file.exists():
+                try:
+                    data = json.loads(state_file.read_text())
+                    bloom.update(data.get("processed_ids", []))
+                    write_atomic(bloom_file, bloom.to_bytes())
+                    state_file.unlink()
+                except Exception:
+                    pass
+
+        log_file = self.vault_path / ".twitter_state.log"
+        if log_file.exists():
+            ids = [line.strip() for line in log_file.read_text().splitlines() if line.strip()]
+            bloom.update(ids)
+            self._log_count = len(ids)
+        return bloom
+
+    def _mark_processed(self, item_id: str):
+        """Record an ID; create_action_files() appends the cycle's IDs at its end."""
+        self._processed_ids.add(item_id)
+        self._unsaved.append(item_id)
 
     def _save_processed(self):
-        state_file = self.vault_path / ".twitter_state.json"
-        state_file.write_text(json.dumps(
-            {"processed_ids": list(self._processed_ids)[-500:]},  # keep last 500
-            indent=2,
-        ))
+        """Append pending IDs to .twitter_state.log, compacting it when due.
+
+        Every COMPACT_EVERY appended IDs the log is folded into a fresh
+        .twitter_state.bloom snapshot and truncated, so neither file grows
+        without bound and no write is proportional to the history size.
+        """
+        if not self._unsaved:
+            return
+        unsaved, self._unsaved = self._unsaved, []
+        log_file = self.vault_path / ".twitter_state.log"
+        with open(log_file, "a") as f:
+            f.write("".join(item_id + "\n" for item_id in unsaved))
+        self._log_count += len(unsaved)
+        if self._log_count >= COMPACT_EVERY:
+            write_atomic(self.vault_path / ".twitter_state.bloom", self._processed_ids.to_bytes())
+            # Truncated only once the new snapshot is in place; a crash in
+            # between just replays IDs the snapshot already holds.
+            log_file.write_text("")
+            self._log_count = 0
+
+    def create_action_files(self, items: list) -> list:
+        """Create a cycle's action files, then persist all their IDs at once."""
+        try:
+            return super().create_action_files(items)
+        finally:
+            self._save_processed()
 
     def check_for_updates(self) -> list:
         if self.dry_run:
@@ -95,95 +234,151 @@ class TwitterWatcher(BaseWatcher):
             logger.warning(f"Twitter session not found at {self.session_path}. Run --setup first.")
             return []
 
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(self._check_async())
+
+    async def _check_async(self) -> list:
+        """Fetch mentions and DMs concurrently on two tabs of one context."""
         items = []
         try:
-            with sync_playwright() as p:
-                browser = p.chromium.launch_persistent_context(
-                    str(self.session_path),
-                    headless=True,
-                    args=["--no-sandbox", "--disable-dev-shm-usage"],
-                )
-                page = browser.pages[0] if browser.pages else browser.new_page()
-
-                # Check mentions
-                mentions = self._get_mentions(page)
-                items.extend(mentions)
-
-                # Check DMs
-                dms = self._get_dms(page)
-                items.extend(dms)
-
-                browser.close()
+            mentions_page, dm_page = await self._ensure_browser()
+            # Both fetches are dominated by navigation and settle waits, so
+            # running them side by side roughly halves the cycle time.
+            mentions, dms = await asyncio.gather(
+                self._get_mentions(mentions_page),
+                self._get_dms(dm_page),
+            )
+            items.extend(mentions)
+            items.extend(dms)
         except PlaywrightTimeout:
             logger.warning("Playwright timeout during Twitter check.")
+            # Page may be wedged — start from a fresh browser next cycle
+            await self._close_browser()
         except Exception as e:
             logger.error(f"Twitter check failed: {e}")
+            await self._close_browser()
 
         return items
 
-    def _get_mentions(self, page) -> list:
+    async def _ensure_browser(self):
+        """Launch the browser once and return its two pages.
+
+        Chromium start-up and session load are paid on the first cycle only;
+        later cycles just navigate the already-open mentions and DM tabs.
+        The login comes from state.json, not the profile directory, so the
+        orchestrator's post_tweet can run meanwhile.
+        """
+        if self._ctx is None:
+            self._pw = await async_playwright().start()
+            self._browser, self._ctx = await new_context_async(
+                self._pw, self.session_path, args=CHROMIUM_ARGS
+            )
+            self._page = await self._ctx.new_page()
+            self._dm_page = await self._ctx.new_page()
+        return self._page, self._dm_page
+
+    async def _close_browser(self):
+        """Close the long-lived browser and Playwright driver, ignoring errors.
+
+        The session's cookies are saved first, so tokens Twitter/X rotated
+        while the browser was open carry over.
+        """
+        if self._ctx is not None:
+            try:
+                await save_storage_state_async(self._ctx, self.session_path)
+            except Exception:
+                pass
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception:
+                pass
+        if self._pw is not None:
+            try:
+                await self._pw.stop()
+            except Exception:
+                pass
+        self._pw = None
+        self._browser = None
+        self._ctx = None
+        self._page = None
+        self._dm_page = None
+
+    def _close(self):
+        """Close the shared browser and its event loop."""
+        if self._loop is not None:
+            self._loop.run_until_complete(self._close_browser())
+            self._loop.close()
+            self._loop = None
+
+    def run(self):
+        """Run the polling loop, closing the shared browser on exit."""
+        try:
+            super().run()
+        finally:
+            self._close()
+            self._save_processed()
+
+    async def _get_mentions(self, page) -> list:
         items = []
         try:
-            page.goto(NOTIFICATIONS_URL, wait_until="domcontentloaded", timeout=30000)
-            page.wait_for_timeout(3000)
+            await page.goto(NOTIFICATIONS_URL, wait_until="domcontentloaded", timeout=30000)
+            # Proceed as soon as the timeline renders instead of a fixed 3s settle
+            await page.wait_for_selector('[data-testid="tweet"]', state="attached", timeout=10000)
 
             # Collect mention tweets
-            tweets = page.query_selector_all('[data-testid="tweet"]')
-            for tweet in tweets[:20]:
-                try:
-                    tweet_text = tweet.inner_text()
-                    # Try to get a unique identifier
-                    links = tweet.query_selector_all("a[href*='/status/']")
-                    tweet_id = None
-                    for link in links:
-                        href = link.get_attribute("href") or ""
-                        if "/status/" in href:
-                            tweet_id = href.split("/status/")[-1].split("/")[0]
-                            break
-
-                    if not tweet_id or tweet_id in self._processed_ids:
-                        continue
-
-                    items.append({
-                        "type": "mention",
-                        "id": tweet_id,
-                        "text": tweet_text[:500],
-                        "url": f"https://x.com/i/web/status/{tweet_id}",
-                        "timestamp": datetime.now().isoformat(),
-                    })
-                except Exception:
+            rows = await page.eval_on_selector_all('[data-testid="tweet"]', _TWEET_ROWS_JS)
+            for row in rows:
+                tweet_id = row["id"]
+                if not tweet_id or tweet_id in self._processed_ids:
                     continue
+
+                items.append({
+                    "type": "mention",
+                    "id": tweet_id,
+                    "text": row["text"],
+                    "url": f"https://x.com/i/web/status/{tweet_id}",
+                    "timestamp": datetime.now().isoformat(),
+                })
+        except PlaywrightTimeout:
+            logger.info("No mentions found.")
         except Exception as e:
             logger.warning(f"Could not fetch mentions: {e}")
         return items
 
-    def _get_dms(self, page) -> list:
+    async def _get_dms(self, page) -> list:
         items = []
         try:
-            page.goto(DM_URL, wait_until="domcontentloaded", timeout=30000)
-            page.wait_for_timeout(3000)
+            await page.goto(DM_URL, wait_until="domcontentloaded", timeout=30000)
+            await page.wait_for_selector(
+                '[data-testid="conversation"]', state="attached", timeout=10000
+            )
 
             # Look for unread DM conversations
-            conv_items = page.query_selector_all('[data-testid="conversation"]')
-            for conv in conv_items[:10]:
-                try:
-                    text = conv.inner_text().lower()
-                    if not any(kw in text for kw in BUSINESS_KEYWORDS):
-                        continue
-
-                    conv_id = f"dm_{hash(text) & 0xFFFFFF:06x}"
-                    if conv_id in self._processed_ids:
-                        continue
-
-                    items.append({
-                        "type": "dm",
-                        "id": conv_id,
-                        "text": conv.inner_text()[:500],
-                        "url": DM_URL,
-                        "timestamp": datetime.now().isoformat(),
-                    })
-                except Exception:
+            rows = await page.eval_on_selector_all(
+                '[data-testid="conversation"]', _CONVERSATION_ROWS_JS
+            )
+            for row in rows:
+                text, href = row["text"], row["href"]
+                keywords = _KEYWORD_MATCHER.find(text.lower())
+                if not keywords:
                     continue
+
+                conv_id = _dm_id(href, text)
+                if conv_id in self._processed_ids:
+                    continue
+
+                items.append({
+                    "type": "dm",
+                    "id": conv_id,
+                    "text": text[:500],
+                    "keywords": keywords,
+                    "url": DM_URL,
+                    "timestamp": datetime.now().isoformat(),
+                })
+        except PlaywrightTimeout:
+            logger.info("No DM conversations found.")
         except Exception as e:
             logger.warning(f"Could not fetch DMs: {e}")
         return items
@@ -194,38 +389,26 @@ class TwitterWatcher(BaseWatcher):
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"TWITTER_{item_type.upper()}_{timestamp}_{item_id[:8]}.md"
 
-        keywords_found = [kw for kw in BUSINESS_KEYWORDS if kw in item.get("text", "").lower()]
+        # DMs were already matched when scraped; mentions are matched here
+        keywords_found = item.get("keywords")
+        if keywords_found is None:
+            keywords_found = _KEYWORD_MATCHER.find(item.get("text", "").lower())
         priority = "high" if keywords_found else "normal"
 
-        content = f"""---
-type: twitter_{item_type}
-platform: twitter_x
-id: {item_id}
-received: {item.get("timestamp", datetime.now().isoformat())}
-priority: {priority}
-status: pending
-keywords_detected: {", ".join(keywords_found) if keywords_found else "none"}
-url: {item.get("url", "")}
----
-
-## Twitter/X {item_type.title()} Received
-
-**Content:**
-{item.get("text", "(no text)")}
-
-## Suggested Actions
-- [ ] Review the {item_type}
-- [ ] Draft reply (create in /Pending_Approval/ for HITL)
-- [ ] Follow up if business opportunity detected
-- [ ] Archive after processing
-
-## Keywords Detected
-{", ".join(keywords_found) if keywords_found else "No business keywords detected."}
-"""
+        joined = ", ".join(keywords_found)
         filepath = self.needs_action / filename
-        filepath.write_text(content)
-        self._processed_ids.add(item_id)
-        self._save_processed()
+        write_file(filepath, _ACTION_TEMPLATE.format_map({
+            "type": item_type,
+            "title": item_type.title(),
+            "id": item_id,
+            "received": item.get("timestamp", datetime.now().isoformat()),
+            "priority": priority,
+            "keywords": joined or "none",
+            "url": item.get("url", ""),
+            "text": item.get("text", "(no text)"),
+            "keywords_section": joined or "No business keywords detected.",
+        }))
+        self._mark_processed(item_id)
 
         self.log_event("twitter_item_detected", {
             "item_type": item_type,
@@ -251,12 +434,8 @@ url: {item.get("url", "")}
 
         try:
             with sync_playwright() as p:
-                browser = p.chromium.launch_persistent_context(
-                    str(session),
-                    headless=True,
-                    args=["--no-sandbox"],
-                )
-                page = browser.pages[0] if browser.pages else browser.new_page()
+                browser, context = new_context(p, session, args=CHROMIUM_ARGS)
+                page = context.new_page()
                 page.goto(TWITTER_URL, wait_until="domcontentloaded", timeout=30000)
 
                 # Click compose button
@@ -314,6 +493,7 @@ def setup_session(vault_path: str, session_path: str):
         page = browser.pages[0] if browser.pages else browser.new_page()
         page.goto(TWITTER_URL)
         input("\nPress ENTER after logging in to Twitter/X...\n")
+        save_storage_state(browser, session)
         browser.close()
 
     print(f"Session saved to: {session}")
@@ -326,7 +506,7 @@ def main():
     parser.add_argument(
         "--session",
         default=os.getenv("TWITTER_SESSION_PATH", str(ROOT / ".twitter_session")),
-        help="Path to Playwright persistent context (session) dir",
+        help="Path to the browser session dir",
     )
     parser.add_argument(
         "--handle",